@@ -1,9 +1,5 @@
-import pygame
-
 WIDTH = 750
 WALL_WIDTH = 10
-WIN = pygame.display.set_mode((WIDTH, WIDTH))  # square window
-pygame.display.set_caption("Maze Generation + Path Finding Algorithm Visualizer")
 
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
@@ -16,6 +12,40 @@ ORANGE = (255, 165, 0)
 GREY = (128, 128, 128)
 TURQUOISE = (64, 224, 208)
 
+# Nodes whose color (_dirty) or walls (_dirty_walls) changed since the last draw. None until something has been drawn,
+# so headless runs don't track anything
+_dirty = None
+_dirty_walls = None
+_last_frame = None  # (win, grid, color) of the last draw
+_wall_layer = None  # transparent surface holding the walls/grid lines of the last frame's grid
+
+
+def mark_dirty(node, walls=False):
+    """
+    Records that a node needs repainting on the next draw
+    :param node: Node (or compact_grid.CellView) whose color or walls changed
+    :param walls: True if its walls changed, so the cached wall layer needs patching too
+    :return: None
+    """
+    if _dirty is not None:
+        _dirty.add(node)
+        if walls:
+            _dirty_walls.add(node)
+
+
+def make_window(width=WIDTH):
+    """
+    Opens the square display window. Nothing in this module touches the display (or imports pygame) until rendering
+    is actually requested, so grids can be built and solved headlessly.
+    :param width: Width/Height of window
+    :return: Window surface
+    """
+    import pygame
+
+    win = pygame.display.set_mode((width, width))  # square window
+    pygame.display.set_caption("Maze Generation & Path Finding Algorithm Visualizer")
+    return win
+
 
 class Node:
     def __init__(self, row, col, width, total_rows):
@@ -37,6 +67,7 @@ class Node:
     def make_walls(self, walls):
         if walls:
             self.walls = [True, True, True, True]
+            mark_dirty(self, walls=True)
 
     def is_closed(self):
         return self.color == RED
@@ -61,15 +92,19 @@ class Node:
 
     def remove_wall(self, pos):
         self.walls[pos] = False
+        mark_dirty(self, walls=True)
 
     def reset(self):
         self.color = WHITE
+        mark_dirty(self)
 
     def make_start(self):
         self.color = ORANGE
+        mark_dirty(self)
 
     def make_closed(self):
         self.color = RED
+        mark_dirty(self)
 
     def make_visited(self):
         self.visited = True
@@ -79,18 +114,23 @@ class Node:
 
     def make_open(self):
         self.color = GREEN
+        mark_dirty(self)
 
     def make_barrier(self):
         self.color = BLACK
+        mark_dirty(self)
 
     def make_end(self):
         self.color = TURQUOISE
+        mark_dirty(self)
 
     def make_path(self):
         self.color = BLUE
+        mark_dirty(self)
 
     def highlight(self):
         self.color = GREEN
+        mark_dirty(self)
 
     def draw(self, win):
         """
@@ -98,6 +138,8 @@ class Node:
         :param win: screen used
         :return: None
         """
+        import pygame
+
         pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.width))
 
     def check_walls(self):
@@ -260,6 +302,8 @@ def draw_grid(win, rows, width):
     :param width: Width of win
     :return: None
     """
+    import pygame
+
     gap = width // rows
     for i in range(rows):
         pygame.draw.line(win, BLACK, (0, i * gap), (width, i * gap))
@@ -269,7 +313,12 @@ def draw_grid(win, rows, width):
 
 def draw(win, grid, rows, width, color=BLACK):
     """
-    Draws each node/animation onto the grid
+    Draws each node/animation onto the grid.
+    Walls (or grid lines when no maze is generated) are rendered once to a cached transparent layer which is composited
+    over the nodes with a blit; the layer is rebuilt for a new grid or background, and patched where walls change.
+    The first frame of a grid is drawn in full. After that only the nodes marked dirty since the previous frame are
+    repainted, and only their rectangles are presented, so the cost of a frame follows what changed rather than the
+    size of the grid.
     :param win: Window to draw on
     :param grid: Grid to draw on
     :param rows: Rows in Grid
@@ -277,17 +326,63 @@ def draw(win, grid, rows, width, color=BLACK):
     :param color: Default Black, only white when no maze is being generated (user creates own barriers etc)
     :return:  None
     """
+    global _dirty, _dirty_walls, _last_frame, _wall_layer
+    import pygame
+
+    same_frame = _last_frame is not None and _last_frame[0] is win and _last_frame[1] is grid and _last_frame[2] == color
+    if not same_frame:
+        _dirty = set()
+        _dirty_walls = set()
+        _last_frame = (win, grid, color)
+        _wall_layer = make_wall_layer(win, grid, rows, width, color)
+        incremental = False
+    else:
+        # patching an area costs about nine cells, past that point a full rebuild/redraw is cheaper
+        if len(_dirty_walls) * 9 < rows * rows:
+            for node in _dirty_walls:
+                _patch_wall_layer(_wall_layer, grid, rows, width, node)
+        else:
+            _wall_layer = make_wall_layer(win, grid, rows, width, color)
+        _dirty_walls.clear()
+        incremental = len(_dirty) * 9 < rows * rows
+
+    if incremental:
+        if _dirty:
+            rects = [_redraw_node(win, grid, rows, width, color, node) for node in _dirty]
+            _dirty.clear()
+            pygame.display.update(rects)
+        return
+
+    _dirty.clear()
     win.fill(color)
 
     for row in grid:
         for node in row:
             node.draw(win)
 
+    win.blit(_wall_layer, (0, 0))
+    pygame.display.update()
+
+
+def make_wall_layer(win, grid, rows, width, color=BLACK):
+    """
+    Renders the static part of a frame, the walls (or the grid lines if no maze is generated), onto a transparent
+    surface the size of win
+    :param win: Window the layer will be blitted onto
+    :param grid: Grid to draw
+    :param rows: Rows in Grid
+    :param width: Width of Grid
+    :param color: Background color, see draw
+    :return: Surface with per-pixel alpha
+    """
+    import pygame
+
+    layer = pygame.Surface(win.get_size(), pygame.SRCALPHA)
     if color != BLACK:
-        draw_grid(win, rows, width)
+        draw_grid(layer, rows, width)
     else:
-        draw_walls(win, grid, rows, width)
-    pygame.display.update()
+        draw_walls(layer, grid, rows, width)
+    return layer
 
 
 def draw_walls(win, grid, rows, width):
@@ -301,15 +396,78 @@ def draw_walls(win, grid, rows, width):
     """
     for row in grid:
         for node in row:
-            if node.walls[0]:  # top
-                pygame.draw.rect(win, BLACK, (node.x, node.y, node.width, (node.width / WALL_WIDTH)))
-            if node.walls[1]:  # right
-                pygame.draw.rect(win, BLACK, (node.x + node.width, node.y, (node.width // WALL_WIDTH), node.width))
-            if node.walls[2]:  # bot
-                pygame.draw.rect(win, BLACK, (
-                    node.x, node.y + node.width, node.width + (node.width // WALL_WIDTH), (node.width // WALL_WIDTH)))
-            if node.walls[3]:  # left
-                pygame.draw.rect(win, BLACK, (node.x, node.y, (node.width // WALL_WIDTH), node.width))
+            draw_node_walls(win, node)
+
+
+def draw_node_walls(win, node):
+    """
+    Draws the walls of a single Node. The right and bottom walls overhang into the neighboring cells.
+    :param win: Window to draw on
+    :param node: Node whose walls are drawn
+    :return: None
+    """
+    import pygame
+
+    if node.walls[0]:  # top
+        pygame.draw.rect(win, BLACK, (node.x, node.y, node.width, (node.width / WALL_WIDTH)))
+    if node.walls[1]:  # right
+        pygame.draw.rect(win, BLACK, (node.x + node.width, node.y, (node.width // WALL_WIDTH), node.width))
+    if node.walls[2]:  # bot
+        pygame.draw.rect(win, BLACK, (
+            node.x, node.y + node.width, node.width + (node.width // WALL_WIDTH), (node.width // WALL_WIDTH)))
+    if node.walls[3]:  # left
+        pygame.draw.rect(win, BLACK, (node.x, node.y, (node.width // WALL_WIDTH), node.width))
+
+
+def _node_area(node, rows, width):
+    """
+    :return: Rectangle covered by a node plus its wall overhangs, and the rows/cols of the 3x3 block of nodes whose
+    drawing can reach into it
+    """
+    import pygame
+
+    gap = width // rows
+    overhang = gap // WALL_WIDTH + 1
+    area = pygame.Rect(node.x, node.y, gap + overhang, gap + overhang)
+    row, col = node.get_pos()
+    return area, range(max(row - 1, 0), min(row + 2, rows)), range(max(col - 1, 0), min(col + 2, rows))
+
+
+def _patch_wall_layer(layer, grid, rows, width, node):
+    """
+    Re-renders the walls around a node whose walls changed onto the cached wall layer, clipped to the node's area
+    :return: None
+    """
+    area, block_rows, block_cols = _node_area(node, rows, width)
+    layer.set_clip(area)
+    layer.fill((0, 0, 0, 0), area)
+    for i in block_rows:
+        for j in block_cols:
+            draw_node_walls(layer, grid[i][j])
+    layer.set_clip(None)
+
+
+def _redraw_node(win, grid, rows, width, color, node):
+    """
+    Repaints the area covered by one node and its wall overhangs: the background and the 3x3 block of nodes around it
+    are redrawn clipped to the area, then the matching piece of the wall layer is blitted on top
+    :param win: Window to draw on
+    :param grid: Grid being drawn
+    :param rows: Rows in Grid
+    :param width: Width of Grid
+    :param color: Background color, see draw
+    :param node: Dirty node
+    :return: The repainted rectangle
+    """
+    area, block_rows, block_cols = _node_area(node, rows, width)
+    win.set_clip(area)
+    win.fill(color, area)
+    for i in block_rows:
+        for j in block_cols:
+            grid[i][j].draw(win)
+    win.set_clip(None)
+    win.blit(_wall_layer, area, area)
+    return area
 
 
 def get_clicked_pos(pos, rows, width):
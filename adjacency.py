@@ -0,0 +1,75 @@
+"""
+Precomputed adjacency of a grid, for the solvers in algorithms.py.
+
+Without it, every solve starts by calling update_paths on every node (a fresh list of up to four neighbors per cell),
+and every expansion calls Grid.wall_between on each of them, working out the direction from pixel coordinates. An
+AdjacencyIndex does that work once: it lays the open neighbors (no wall in between, not a barrier) of every cell out
+CSR style, in a flat list with a fixed stride of 4 slots per cell, and keeps each cell's count in a degree array. Cell
+i's neighbors are targets[4 * i:4 * i + degree[i]], in the same order update_paths lists them (down, up, right, left),
+so a solver visits cells in the same order as before.
+
+Editing a barrier only changes the edges of that cell and its four neighbors, so update(node) refreshes five cells
+and the index stays valid for as long as the grid's walls don't change.
+"""
+
+# (wall index, row offset, col offset) of each neighbor, in update_paths order: down, up, right, left
+ORDER = ((1, 1, 0), (3, -1, 0), (2, 0, 1), (0, 0, -1))
+
+
+class AdjacencyIndex:
+    def __init__(self, grid):
+        """
+        :param grid: grid being used (a Grid.make_grid style grid of Nodes or a CompactGrid) with its walls finished
+        """
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.nodes = [node for row in grid for node in row]
+        self.targets = [None] * (4 * len(self.nodes))
+        self.degree = bytearray(len(self.nodes))
+        for index in range(len(self.nodes)):
+            self._refresh(index)
+
+    def _refresh(self, index):
+        """Recomputes the open neighbors of one cell"""
+        nodes = self.nodes
+        targets = self.targets
+        base = 4 * index
+        count = 0
+        node = nodes[index]
+        if not node.is_barrier():
+            walls = node.walls
+            row, col = divmod(index, self.cols)
+            for direction, d_row, d_col in ORDER:
+                n_row = row + d_row
+                n_col = col + d_col
+                if walls[direction] or not (0 <= n_row < self.rows and 0 <= n_col < self.cols):
+                    continue
+                neighbor = nodes[n_row * self.cols + n_col]
+                if not neighbor.is_barrier():
+                    targets[base + count] = neighbor
+                    count += 1
+        for slot in range(base + count, base + 4):
+            targets[slot] = None
+        self.degree[index] = count
+
+    def neighbors(self, node):
+        """
+        :param node: Node (or CellView) of the indexed grid
+        :return: list of the neighbors reachable from node in one step
+        """
+        index = node.row * self.cols + node.col
+        base = 4 * index
+        return self.targets[base:base + self.degree[index]]
+
+    def update(self, node):
+        """
+        Refreshes the index after node was made a barrier or erased
+        :param node: edited node
+        :return: None
+        """
+        row = node.row
+        col = node.col
+        self._refresh(row * self.cols + col)
+        for _, d_row, d_col in ORDER:
+            if 0 <= row + d_row < self.rows and 0 <= col + d_col < self.cols:
+                self._refresh((row + d_row) * self.cols + col + d_col)
@@ -1,7 +1,19 @@
+"""
+Maze generation and pathfinding algorithms.
+
+Every algorithm is written as a resumable step generator (astar_steps, prims_steps, ...). Each next() performs one
+step of the algorithm and yields the cells whose state changed in that step; the generator's return value is the
+algorithm's result. This lets a caller pause, single-step, cancel or fast-forward an algorithm (see
+scheduler.Scheduler).
+The original blocking functions (astar(draw, grid, start, end), prims(grid, draw, rows), ...) are kept as wrappers
+which run the steps to completion, calling draw() after each one.
+None of these touch pygame, so passing a no-op draw (lambda: None) runs them headlessly.
+"""
 import random
-from queue import PriorityQueue, LifoQueue, Queue
-import pygame
-from Grid import remove_walls, wall_between
+from heapq import heapify, heappush, heappop
+from Grid import remove_walls
+from adjacency import AdjacencyIndex
+from structures import DisjointSet, PriorityFrontier, FifoFrontier, LifoFrontier, RandomizedSet
 
 def h(p1, p2):
     """
@@ -15,76 +27,150 @@ def h(p1, p2):
     return abs(x1 - x2) + abs(y1 - y2)
 
 
-def reconstruct_path(came_from, current, draw):
+def run(steps, draw):
+    """
+    Runs a step generator to completion
+    :param steps: step generator, e.g. astar_steps(grid, start, end)
+    :param draw: called after every step
+    :return: The generator's return value (the algorithm's result)
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+        draw()
+
+
+def reconstruct_path_steps(came_from, current):
     """
     Reconstructs path found in all pathfinding algorithms by using a dict/hash map which indicates the node each node
-    came from.
-    :param came_from:
-    :param current:
-    :param draw:
-    :return:
+    came from. Yields each node as it is added to the path.
+    :param came_from: dict mapping each node to the node it was reached from
+    :param current: node to trace back from (the end node)
+    :return: None
     """
     while current in came_from:
         current = came_from[current]
         current.make_path()
-        draw()
+        yield (current,)
+
+
+def reconstruct_path(came_from, current, draw):
+    """
+    Blocking version of reconstruct_path_steps
+    :param came_from: dict mapping each node to the node it was reached from
+    :param current: node to trace back from (the end node)
+    :param draw: called after each node is added to the path
+    :return: None
+    """
+    run(reconstruct_path_steps(came_from, current), draw)
 
 
-def dijkstras(draw, grid, start, end):
+def paint_cells_steps(grid, cells, end):
+    """
+    Paints a path found off the grid (a list of cells) the way reconstruct_path_steps does, one cell per step
+    :param grid: grid being used
+    :param cells: (row, col) of every cell of the path from start to end, both included. Empty if there is no path
+    :param end: target end node
+    :return: True if path found, false if no possible path
+    """
+    for row, col in cells[:-1]:
+        node = grid[row][col]
+        node.make_path()
+        yield (node,)
+    end.make_end()
+    return bool(cells)
+
+
+def graph_astar(sources, targets, edges, cols, end, best=float("inf")):
+    """
+    A* over a weighted graph of flat cell indexes (row * cols + col), as contracted from a maze by corridors.py and
+    hpa_star.py. The search starts from several nodes at once and ends at any of several, each with its own distance
+    to the real start or end
+    :param sources: dict mapping each node the search starts from to its distance from the start
+    :param targets: dict mapping each node the end can be reached from to its distance to the end
+    :param edges: function of a node returning (neighbor, weight, label) for each of its edges
+    :param cols: columns of the maze, to turn nodes back into positions for the heuristic
+    :param end: flat index of the end cell
+    :param best: length of a path to the end already known without the graph
+    :return: (length of the shortest path, the target it ends through or None if no path through the graph is
+    shorter than best, dict mapping each node to (node it was reached from, label of the edge), nodes expanded)
+    """
+    goal = divmod(end, cols)
+    best_via = None
+    expanded = 0
+    g_score = dict(sources)
+    came_from = {}
+    open_set = [(distance + h(divmod(node, cols), goal), distance, node) for node, distance in sources.items()]
+    heapify(open_set)
+
+    while open_set:
+        f_score, distance, current = heappop(open_set)
+        if f_score >= best:
+            break
+        if distance > g_score[current]:  # stale entry left behind by a cheaper route
+            continue
+        expanded += 1
+
+        if current in targets and distance + targets[current] < best:
+            best = distance + targets[current]
+            best_via = current
+
+        for other, weight, label in edges(current):
+            temp_g_score = distance + weight
+            if temp_g_score < g_score.get(other, float("inf")):
+                g_score[other] = temp_g_score
+                came_from[other] = (current, label)
+                heappush(open_set, (temp_g_score + h(divmod(other, cols), goal), temp_g_score, other))
+
+    return best, best_via, came_from, expanded
+
+
+def dijkstras_steps(grid, start, end, adjacency=None):
     """
     Dijkstras Pathfinding Algorithm. Guaranteed to be the shortest path.
-    Stores distance from start to use PriorityQueue. Chooses lowest distance node. Visits all possible nodes until end
+    Stores distance from start to use a priority queue. Chooses lowest distance node. Visits all possible nodes until end
     is found.
     Uses came_from dict to reconstruct pathway
-    :param draw: draws animations onto the screen
     :param grid: grid being used
     :param start: starting node
     :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
     :return: True if path found, false if no possible path
     """
-    open_set = PriorityQueue()
-    open_set.put((0, start))
-    distances = {node: float("inf") for row in grid for node in row}
-    distances[start] = 0
+    open_set = PriorityFrontier()
+    open_set.put(start, 0)
+    distances = {start: 0}
     came_from = {}
-    start.update_paths(grid)
+    if adjacency is None:
+        adjacency = AdjacencyIndex(grid)
 
     while not open_set.empty():
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        curr_distance, curr = open_set.get()
-
-        pygame.time.delay(20)
+        curr_distance, curr = open_set.get_with_priority()
+        changed = [curr]
 
         if curr == end:
-            reconstruct_path(came_from, end, draw)
+            yield from reconstruct_path_steps(came_from, end)
             end.make_end()
             return True
 
         if curr_distance > distances[curr]:
             continue
 
-        for path in curr.paths:
-
-            if wall_between(curr, path) or path.is_barrier():
-                continue
+        for path in adjacency.neighbors(curr):
 
             distance = curr_distance + 1
 
-            if distance < distances[path]:
+            if distance < distances.get(path, float("inf")):
                 came_from[path] = curr
-                curr_distance += 1
                 distances[path] = distance
-                open_set.put((distance, path))
+                open_set.put(path, distance)
                 path.make_open()
+                changed.append(path)
 
-        if len(curr.paths) == 0:
-            print("No available paths")
-
-        draw()
+        yield changed
 
         if curr != start:
             curr.make_closed()
@@ -92,50 +178,59 @@ def dijkstras(draw, grid, start, end):
     return False
 
 
-def BFS(draw, grid, start, end):
+def dijkstras(draw, grid, start, end, adjacency=None):
+    """
+    Blocking version of dijkstras_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, otherwise false
+    """
+    return run(dijkstras_steps(grid, start, end, adjacency), draw)
+
+
+def BFS_steps(grid, start, end, adjacency=None):
     """
     Finds path from start to end node using the classic BFS algorithm. Not guaranteed to be the shortest path.
     Uses a queue to store nodes.
     Returns True upon success
-    :param draw: draws animations of search onto the screen
     :param grid: grid being used
     :param start: starting node
     :param end: ending node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
     :return: True upon path found, false if no possible path
     """
     came_from = {}
-    queue = Queue()
+    seen = {start}
+    queue = FifoFrontier()
     queue.put(start)
-    start.make_visited()
+    if adjacency is None:
+        adjacency = AdjacencyIndex(grid)
 
     while not queue.empty():
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
         curr = queue.get()
-
-        pygame.time.delay(20)
+        changed = [curr]
 
         if curr == end:
-            reconstruct_path(came_from, end, draw)
+            yield from reconstruct_path_steps(came_from, end)
             end.make_end()
             return True
 
-        curr.update_neighbors(grid)
+        for neighbor in adjacency.neighbors(curr):
 
-        for neighbor in curr.neighbors:
-
-            if wall_between(neighbor, curr) or neighbor.is_barrier():
+            if neighbor in seen:
                 continue
 
-            neighbor.make_visited()
+            seen.add(neighbor)
             came_from[neighbor] = curr
             queue.put(neighbor)
             neighbor.make_open()
+            changed.append(neighbor)
 
-        draw()
+        yield changed
 
         if curr != start:
             curr.make_closed()
@@ -143,51 +238,60 @@ def BFS(draw, grid, start, end):
     return False
 
 
-def dfs_pathfinder(draw, grid, start, end):
+def BFS(draw, grid, start, end, adjacency=None):
+    """
+    Blocking version of BFS_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, otherwise false
+    """
+    return run(BFS_steps(grid, start, end, adjacency), draw)
+
+
+def dfs_pathfinder_steps(grid, start, end, adjacency=None):
     """
     Classic Depth-First Search Algorithm to find a path. Not guaranteed to be the shortest path
     Uses a stack to store nodes unlike the BFS algorithm which uses a queue.
     Returns true if path found
     Reconstructs path using reconstruct_path function
-    :param draw: draws animations onto the screen
     :param grid: grid being used
     :param start: starting node
     :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
     :return: True if path found, otherwise false
     """
-    stack = LifoQueue()
-    start.make_visited()
+    stack = LifoFrontier()
+    seen = {start}
     stack.put(start)
     came_from = {}
+    if adjacency is None:
+        adjacency = AdjacencyIndex(grid)
 
     while not stack.empty():
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
         curr = stack.get()
-
-        pygame.time.delay(20)
+        changed = [curr]
 
         if curr == end:
-            reconstruct_path(came_from, end, draw)
+            yield from reconstruct_path_steps(came_from, end)
             end.make_end()
             return True
 
-        curr.update_neighbors(grid)
-
-        for neighbor in curr.neighbors:
+        for neighbor in adjacency.neighbors(curr):
 
-            if wall_between(neighbor, curr) or neighbor.is_barrier():
+            if neighbor in seen:
                 continue
 
-            neighbor.make_visited()
+            seen.add(neighbor)
             came_from[neighbor] = curr
             stack.put(neighbor)
             neighbor.make_open()
+            changed.append(neighbor)
 
-        draw()
+        yield changed
 
         if curr != start:
             curr.make_closed()
@@ -195,52 +299,60 @@ def dfs_pathfinder(draw, grid, start, end):
     return False
 
 
-def greedy_best_first(draw, grid, start, end):
+def dfs_pathfinder(draw, grid, start, end, adjacency=None):
+    """
+    Blocking version of dfs_pathfinder_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, otherwise false
+    """
+    return run(dfs_pathfinder_steps(grid, start, end, adjacency), draw)
+
+
+def greedy_best_first_steps(grid, start, end, adjacency=None):
     """
     Finds a path to the target destination. NOT GUARANTEED TO BE THE SHORTEST PATH
     Weighted DFS/BFS algorithm. Uses a priority queue and a heuristic function (manhatten distance) in order to choose
     which node it will visit next.
     Returns true if path founds. Backtracks using the came_from hash map to reconstruct the path
-    :param draw: draws animations onto the screen
     :param grid: grid being used
     :param start: starting node
     :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
     :return: True if path found, otherwise false if no possible path
     """
-    open_set = PriorityQueue()
+    open_set = PriorityFrontier()
     came_from = {}
-    open_set.put((h(start.get_pos(), end.get_pos()), start))
+    seen = {start}
+    open_set.put(start, h(start.get_pos(), end.get_pos()))
+    if adjacency is None:
+        adjacency = AdjacencyIndex(grid)
 
     while not open_set.empty():
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        curr = open_set.get()[1]
-
-        curr.make_visited()
-
-        pygame.time.delay(20)
+        curr = open_set.get()
+        changed = [curr]
 
         if curr == end:
-            reconstruct_path(came_from, end, draw)
+            yield from reconstruct_path_steps(came_from, end)
             end.make_end()
             return True
 
-        curr.update_neighbors(grid)
-
-        for neighbor in curr.neighbors:
+        for neighbor in adjacency.neighbors(curr):
 
-            if wall_between(neighbor, curr) or neighbor.is_barrier():
+            if neighbor in seen:
                 continue
 
-            neighbor.make_visited()
+            seen.add(neighbor)
             came_from[neighbor] = curr
-            open_set.put((h(neighbor.get_pos(), end.get_pos()), neighbor))
+            open_set.put(neighbor, h(neighbor.get_pos(), end.get_pos()))
             neighbor.make_open()
+            changed.append(neighbor)
 
-        draw()
+        yield changed
 
         if curr != start:
             curr.make_closed()
@@ -248,68 +360,65 @@ def greedy_best_first(draw, grid, start, end):
     return False
 
 
-def astar(draw, grid, start, end):
+def greedy_best_first(draw, grid, start, end, adjacency=None):
+    """
+    Blocking version of greedy_best_first_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, otherwise false
+    """
+    return run(greedy_best_first_steps(grid, start, end, adjacency), draw)
+
+
+def astar_steps(grid, start, end, adjacency=None):
     """
     A* Pathfinding Algorithm: Finds the shortest path from start node to target node in an extremely effective way
-    Uses a PriorityQueue with an f score, where f =  h + g
+    Uses a priority queue with an f score, where f =  h + g
     h = heuristic function(manhatten distance from current node to target node)
     g = amount of steps taken/cost from the start node to the current node
     Once target node has been reached, backtracks using the came_from hash map and the reconstruct_path funciton
-    :param draw: draw function used to draw animations to the screen
     :param grid: grid being used
     :param start: start node
     :param end: end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
     :return: True upon success, false if no possible path
     """
-    count = 0
-    open_set = PriorityQueue()
-    open_set.put((0, count, start))
+    open_set = PriorityFrontier()
+    open_set.put(start, 0)
     came_from = {}
-    g_score = {node: float("inf") for row in grid for node in row}
-    g_score[start] = 0
-    f_score = {node: float("inf") for row in grid for node in row}
-    f_score[start] = h(start.get_pos(), end.get_pos())
-    start.update_paths(grid)
+    g_score = {start: 0}
+    if adjacency is None:
+        adjacency = AdjacencyIndex(grid)
 
     open_set_hash = {start}
 
     while not open_set.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current = open_set.get()[2]
+        current = open_set.get()
         open_set_hash.remove(current)
+        changed = [current]
 
         if current == end:
-            reconstruct_path(came_from, end, draw)
+            yield from reconstruct_path_steps(came_from, end)
             end.make_end()
             return True
 
-        for path in current.paths:
-
-            # skip over pathways which contain walls
-            if wall_between(current, path) or path.is_barrier():
-                continue
-
-            pygame.time.delay(20)
+        for path in adjacency.neighbors(current):
 
             temp_g_score = g_score[current] + 1
 
-            if temp_g_score < g_score[path]:
+            if temp_g_score < g_score.get(path, float("inf")):
                 came_from[path] = current
                 g_score[path] = temp_g_score
-                f_score[path] = temp_g_score + h(path.get_pos(), end.get_pos())
                 if path not in open_set_hash:
-                    count += 1
-                    open_set.put((f_score[path], count, path))
+                    open_set.put(path, temp_g_score + h(path.get_pos(), end.get_pos()))
                     open_set_hash.add(path)
                     path.make_open()
+                    changed.append(path)
 
-        if len(current.paths) == 0:
-            print("No available paths")
-
-        draw()
+        yield changed
 
         if current != start:
             current.make_closed()
@@ -317,66 +426,396 @@ def astar(draw, grid, start, end):
     return False
 
 
+def astar(draw, grid, start, end, adjacency=None):
+    """
+    Blocking version of astar_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, otherwise false
+    """
+    return run(astar_steps(grid, start, end, adjacency), draw)
+
 
+def _join_paths(came_from, came_to, meet, end):
+    """
+    Joins the halves of a bidirectional search into one came_from dict running from start to end
+    :param came_from: dict mapping each node reached from the start to the node it was reached from
+    :param came_to: dict mapping each node reached from the end to the node after it on the way to the end
+    :param meet: node where the two searches met (already linked into came_from)
+    :param end: target end node
+    :return: None
+    """
+    curr = meet
+    while curr != end:
+        came_from[came_to[curr]] = curr
+        curr = came_to[curr]
 
 
-def kruskals(grid, draw, rows):
+def bidirectional_BFS_steps(grid, start, end, adjacency=None):
     """
-    Randomize Kruskals Algorithm For Maze Generation:
-    Create a list of all walls, and create list of sets of each cell, each containing just that one cell.
-    For each wall, in some random order:
-    If the cells divided by this wall belong to distinct sets:
-    Remove the current wall.
-    Join the sets of the formerly divided cells.
+    Bidirectional BFS: runs one BFS from the start and one from the end, expanding whole layers of the smaller
+    frontier at a time, until a cell reached by one search is reached by the other. Guaranteed to be the shortest path.
+    Once the last layer of each search has been fully expanded without meeting, the two searches have seen every cell
+    within df of the start and db of the end, so the shortest path is at least df + db + 1 steps. The first cell found
+    by both is df + 1 (or db + 1) steps from its own end and at most db (or df) steps from the other, so the path
+    through it has that length and the search can stop right away.
+    Explores about two balls of half the radius of a BFS, which is far fewer cells on open grids.
     :param grid: grid being used
-    :param draw: draw function in order to draw animations as they happen
-    :param rows: rows in grid: unused, could be used to randomize/ set a static starting point
-    :return: True upon success
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, false if no possible path
     """
-    all_walls = [wall for row in grid for wall in row]  # create list of "walls" (just cells)
-    all_cells = [{cell} for row in grid for cell in row]  # create list of sets of each cell
+    if start == end:
+        return True
+
+    if adjacency is None:
+        adjacency = AdjacencyIndex(grid)
+    came_from = {start: None}
+    came_to = {end: None}
+    forward = [start]
+    backward = [end]
+
+    while forward and backward:
+        if len(forward) <= len(backward):
+            layer, seen, other = forward, came_from, came_to
+        else:
+            layer, seen, other = backward, came_to, came_from
+        next_layer = []
+
+        for curr in layer:
+            changed = [curr]
+            for path in adjacency.neighbors(curr):
+
+                if path in seen:
+                    continue
+
+                seen[path] = curr
+                if path in other:
+                    del came_from[start]
+                    del came_to[end]
+                    _join_paths(came_from, came_to, path, end)
+                    yield changed
+                    yield from reconstruct_path_steps(came_from, end)
+                    end.make_end()
+                    return True
+
+                next_layer.append(path)
+                path.make_open()
+                changed.append(path)
 
-    while len(all_cells) > 1:  # loop until all sets are joined
+            yield changed
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
+            if curr != start and curr != end:
+                curr.make_closed()
 
-        wall = random.choice(all_walls)  # pick a random wall
-        wall.update_paths(grid)  # update the walls available paths
+        if layer is forward:
+            forward = next_layer
+        else:
+            backward = next_layer
 
-        # get index of current wall
-        for cell_set in all_cells:
-            if wall in cell_set:
-                wall_index = all_cells.index(cell_set)
+    return False
 
-        wall_set = all_cells[wall_index]
-        neighbor = random.choice(wall.paths)
 
-        # if the neighbor is in the current walls set already, do nothing
-        if neighbor in wall_set:
-            continue
-        # otherwise, remove the wall between the cell and its neighbor, union their sets and remove the old set
+def bidirectional_BFS(draw, grid, start, end, adjacency=None):
+    """
+    Blocking version of bidirectional_BFS_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, otherwise false
+    """
+    return run(bidirectional_BFS_steps(grid, start, end, adjacency), draw)
+
+
+def bidirectional_astar_steps(grid, start, end, adjacency=None):
+    """
+    Bidirectional A*: runs one A* from the start towards the end and one from the end towards the start, always
+    expanding the side with the smaller open set. Guaranteed to be the shortest path.
+    mu is the length of the best path found so far through a cell reached by both searches. Every f score is a lower
+    bound on the length of any path through that cell, and while a shortest path is unfinished one of its cells is on
+    each open set with its true g score, so the search stops once either open set's lowest f score is at least mu.
+    :param grid: grid being used
+    :param start: start node
+    :param end: end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True upon success, false if no possible path
+    """
+    if start == end:
+        return True
+
+    if adjacency is None:
+        adjacency = AdjacencyIndex(grid)
+    start_pos = start.get_pos()
+    end_pos = end.get_pos()
+    forward = (PriorityFrontier(), {start: 0}, {}, set(), end_pos)
+    backward = (PriorityFrontier(), {end: 0}, {}, set(), start_pos)
+    forward[0].put(start, h(start_pos, end_pos))
+    backward[0].put(end, h(end_pos, start_pos))
+    mu = float("inf")
+    meet = None
+
+    while not forward[0].empty() and not backward[0].empty():
+        if forward[0].peek_priority() >= mu or backward[0].peek_priority() >= mu:
+            break
+
+        if len(forward[0]) <= len(backward[0]):
+            (open_set, g_score, came_from, closed, target), other_g = forward, backward[1]
         else:
-            for cell_set in all_cells:
-                if neighbor in cell_set:
-                    neighbor_index = all_cells.index(cell_set)
-            neighbor_set = all_cells[neighbor_index]
-            all_cells[wall_index] = wall_set.union(neighbor_set)
-            all_cells.remove(neighbor_set)
-
-            wall.reset()
-            neighbor.reset()
-            remove_walls(wall, neighbor)
-            draw()
+            (open_set, g_score, came_from, closed, target), other_g = backward, forward[1]
 
+        current = open_set.get()
+        if current in closed:  # stale entry left behind by a cheaper route
+            continue
+        closed.add(current)
+        changed = [current]
+
+        for path in adjacency.neighbors(current):
+
+            temp_g_score = g_score[current] + 1
+
+            if temp_g_score < g_score.get(path, float("inf")):
+                came_from[path] = current
+                g_score[path] = temp_g_score
+                open_set.put(path, temp_g_score + h(path.get_pos(), target))
+                if path != start and path != end:
+                    path.make_open()
+                    changed.append(path)
+
+            if path in other_g and g_score[path] + other_g[path] < mu:
+                mu = g_score[path] + other_g[path]
+                meet = path
+
+        yield changed
+
+        if current != start and current != end:
+            current.make_closed()
+
+    if meet is None:
+        return False
+
+    came_from = forward[2]
+    _join_paths(came_from, backward[2], meet, end)
+    yield from reconstruct_path_steps(came_from, end)
+    end.make_end()
     return True
 
 
+def bidirectional_astar(draw, grid, start, end, adjacency=None):
+    """
+    Blocking version of bidirectional_astar_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid, built here if not given
+    :return: True if path found, otherwise false
+    """
+    return run(bidirectional_astar_steps(grid, start, end, adjacency), draw)
+
+
+def jump_point_search_steps(grid, start, end):
+    """
+    Jump Point Search (4-connected): A* for open grids with uniform step costs, where barrier cells are the only
+    obstacles (the N mode grid). Guaranteed to be the shortest path.
+    Rather than adding every neighbor to the open set, each direction is followed in a straight line until it reaches
+    the end, a cell with a forced neighbor (an opening beside the line just past a barrier), or for vertical moves a
+    cell from which a horizontal jump finds one of those. Only these jump points are added to the open set, so the
+    many equivalent orderings of the same steps are never explored. Successors of a jump point are pruned to the
+    directions which don't lead back to its parent.
+    Cell walls are ignored, so this should not be used on generated mazes.
+    :param grid: grid being used
+    :param start: start node
+    :param end: end node
+    :return: True upon success, false if no possible path
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    walkable = [[not node.is_barrier() for node in row] for row in grid]
+    end_pos = end.get_pos()
+
+    def free(row, col):
+        return 0 <= row < rows and 0 <= col < cols and walkable[row][col]
+
+    def jump_horizontal(row, col, d_col):
+        while free(row, col):
+            if (row, col) == end_pos:
+                return row, col
+            if (free(row - 1, col) and not free(row - 1, col - d_col)) or \
+                    (free(row + 1, col) and not free(row + 1, col - d_col)):
+                return row, col
+            col += d_col
+        return None
+
+    def jump_vertical(row, col, d_row):
+        while free(row, col):
+            if (row, col) == end_pos:
+                return row, col
+            if (free(row, col - 1) and not free(row - d_row, col - 1)) or \
+                    (free(row, col + 1) and not free(row - d_row, col + 1)):
+                return row, col
+            if jump_horizontal(row, col + 1, 1) or jump_horizontal(row, col - 1, -1):
+                return row, col
+            row += d_row
+        return None
+
+    def directions(pos):
+        row, col = pos
+        if pos not in came_from:
+            return (-1, 0), (1, 0), (0, -1), (0, 1)
+        parent_row, parent_col = came_from[pos]
+        if row == parent_row:
+            return (-1, 0), (1, 0), (0, 1 if col > parent_col else -1)
+        return (0, -1), (0, 1), (1 if row > parent_row else -1, 0)
+
+    start_pos = start.get_pos()
+    open_set = PriorityFrontier()
+    open_set.put(start_pos, h(start_pos, end_pos))
+    came_from = {}  # jump point -> previous jump point, in a straight line from it
+    g_score = {start_pos: 0}
+    closed = set()
+
+    while not open_set.empty():
+        pos = open_set.get()
+        if pos in closed:  # stale entry left behind by a cheaper route
+            continue
+        closed.add(pos)
+        current = grid[pos[0]][pos[1]]
+        changed = [current]
+
+        if pos == end_pos:
+            yield from reconstruct_path_steps(_expand_jumps(grid, came_from, end_pos), end)
+            end.make_end()
+            return True
+
+        for d_row, d_col in directions(pos):
+            if d_row:
+                jump = jump_vertical(pos[0] + d_row, pos[1], d_row)
+            else:
+                jump = jump_horizontal(pos[0], pos[1] + d_col, d_col)
+            if jump is None or jump in closed:
+                continue
+
+            temp_g_score = g_score[pos] + h(pos, jump)
+            if temp_g_score < g_score.get(jump, float("inf")):
+                came_from[jump] = pos
+                g_score[jump] = temp_g_score
+                open_set.put(jump, temp_g_score + h(jump, end_pos))
+                node = grid[jump[0]][jump[1]]
+                node.make_open()
+                changed.append(node)
 
+        yield changed
 
+        if current != start:
+            current.make_closed()
 
-def aldous_broder(grid, draw, rows):
+    return False
+
+
+def _expand_jumps(grid, came_from, pos):
+    """
+    Fills in the straight runs of cells between jump points
+    :param grid: grid being used
+    :param came_from: dict mapping each jump point (row, col) to the jump point it was reached from
+    :param pos: (row, col) of the last jump point (the end)
+    :return: dict mapping each node on the path to the node before it, as used by reconstruct_path_steps
+    """
+    cells = {}
+    while pos in came_from:
+        parent = came_from[pos]
+        d_row = (parent[0] > pos[0]) - (parent[0] < pos[0])
+        d_col = (parent[1] > pos[1]) - (parent[1] < pos[1])
+        row, col = pos
+        while (row, col) != parent:
+            cells[grid[row][col]] = grid[row + d_row][col + d_col]
+            row += d_row
+            col += d_col
+        pos = parent
+    return cells
+
+
+def jump_point_search(draw, grid, start, end):
+    """
+    Blocking version of jump_point_search_steps
+    :param draw: draws animations onto the screen
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :return: True if path found, otherwise false
+    """
+    return run(jump_point_search_steps(grid, start, end), draw)
+
+
+def kruskals_steps(grid, rng=random):
+    """
+    Randomize Kruskals Algorithm For Maze Generation:
+    Create a list of all walls, and create a set for each cell, each containing just that one cell.
+    For each wall, in some random order:
+    If the cells divided by this wall belong to distinct sets:
+    Remove the current wall.
+    Join the sets of the formerly divided cells.
+    The sets are kept in a disjoint-set forest and the walls are visited in one shuffled pass, so generation runs in
+    O(E α(V)) time instead of rescanning a list of sets for every wall.
+    :param grid: grid being used
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon success
+    """
+    cells = [cell for row in grid for cell in row]
+    cols = len(grid[0])
+
+    # wall 2 * i separates cell i from grid[row + 1][col], wall 2 * i + 1 separates it from grid[row][col + 1]
+    walls = []
+    for i in range(len(cells)):
+        if i < len(cells) - cols:
+            walls.append(2 * i)
+        if i % cols < cols - 1:
+            walls.append(2 * i + 1)
+    rng.shuffle(walls)
+
+    sets = DisjointSet(len(cells))
+    remaining = len(cells) - 1  # a spanning tree has one less passage than there are cells
+
+    for wall in walls:
+        if remaining == 0:
+            break
+
+        i, horizontal = divmod(wall, 2)
+        j = i + 1 if horizontal else i + cols
+
+        # if the cells are already in the same set, removing the wall would create a loop
+        if not sets.union(i, j):
+            continue
+
+        cell = cells[i]
+        neighbor = cells[j]
+        cell.reset()
+        neighbor.reset()
+        remove_walls(cell, neighbor)
+        remaining -= 1
+        yield cell, neighbor
+
+    return True
+
+
+def kruskals(grid, draw, rows, rng=random):
+    """
+    Blocking version of kruskals_steps
+    :param grid: grid being used
+    :param draw: draws animations to the screen
+    :param rows: rows in grid: unused, kept for compatibility
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon successful maze generation
+    """
+    return run(kruskals_steps(grid, rng), draw)
+
+
+def aldous_broder_steps(grid, rng=random):
     """
     WARNING: ALGORITHM EXTREMELY SLOW/FRUSTRATING TO WATCH
     Pick a random cell as the current cell and mark it as visited.
@@ -387,99 +826,171 @@ def aldous_broder(grid, draw, rows):
       Mark the chosen neighbour as visited.
     Make the chosen neighbour the current cell.
     :param grid: grid being used
-    :param draw: draws animations to the screen
-    :param rows: rows in grid
+    :param rng: random number generator (random.Random or the random module) used for every random choice
     :return: True upon maze successfully created
     """
-    curr = grid[random.randint(0, rows - 1)][random.randint(0, rows - 1)]
-    unvisited_cells = [node for row in grid for node in row]
+    rows = len(grid)
+    curr = grid[rng.randint(0, rows - 1)][rng.randint(0, len(grid[0]) - 1)]
+    unvisited = rows * len(grid[0]) - 1
     curr.make_visited()
     curr.reset()
-    unvisited_cells.remove(curr)
-    while len(unvisited_cells) > 0:
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
+    while unvisited > 0:
 
         curr.update_paths(grid)
         curr.reset()
         # curr.make_visited()
-        neighbor = random.choice(curr.paths)
+        neighbor = rng.choice(curr.paths)
 
         if not neighbor.is_visited():
             neighbor.make_visited()
             neighbor.reset()
             remove_walls(curr, neighbor)
-            unvisited_cells.remove(neighbor)
+            unvisited -= 1
 
+        prev = curr
         curr = neighbor
         curr.highlight()
-        pygame.time.delay(10)
-        draw()
+        yield prev, curr
     curr.reset()
 
     return True
 
 
+def aldous_broder(grid, draw, rows, rng=random):
+    """
+    Blocking version of aldous_broder_steps
+    :param grid: grid being used
+    :param draw: draws animations to the screen
+    :param rows: rows in grid: unused, kept for compatibility
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon successful maze generation
+    """
+    return run(aldous_broder_steps(grid, rng), draw)
 
 
+def wilsons_steps(grid, rng=random):
+    """
+    Wilson's Algorithm: builds a uniform spanning tree (every possible maze is equally likely, just like Aldous-Broder)
+    using loop-erased random walks.
+    Add a random cell to the maze.
+    While there are cells not in the maze:
+      Pick a random cell not in the maze and random walk from it until a cell in the maze is reached, remembering the
+      direction last taken out of each cell. Overwriting that direction when the walk revisits a cell erases the loop.
+      Follow the remembered directions from the walk's first cell, carving passages and adding each cell to the maze.
+    Each walk only has to reach the maze so far, not cover the whole grid, so this finishes far sooner than
+    Aldous-Broder. The cells not yet in the maze are kept in a RandomizedSet so picking and removing them is O(1).
+    :param grid: grid being used
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon maze successfully created
+    """
+    outside = RandomizedSet(node for row in grid for node in row)
+    curr = outside.choice(rng)
+    outside.remove(curr)
+    curr.make_visited()
+    curr.reset()
+
+    while len(outside) > 0:
+
+        # loop-erased random walk until it reaches the maze
+        walk_start = curr = outside.choice(rng)
+        exits = {}
+        while not curr.is_visited():
+            curr.update_paths(grid)
+            exits[curr] = rng.choice(curr.paths)
+            prev = curr
+            curr = exits[curr]
+            prev.make_barrier()
+            curr.highlight()
+            yield prev, curr
+        curr.reset()
+
+        # carve the walk (without its loops) into the maze
+        curr = walk_start
+        while not curr.is_visited():
+            neighbor = exits[curr]
+            curr.make_visited()
+            curr.reset()
+            outside.remove(curr)
+            remove_walls(curr, neighbor)
+            yield curr, neighbor
+            curr = neighbor
 
-def hunt_and_kill(grid, draw, rows):
+    return True
+
+
+def wilsons(grid, draw, rows, rng=random):
+    """
+    Blocking version of wilsons_steps
+    :param grid: grid being used
+    :param draw: draws animations to the screen
+    :param rows: rows in grid: unused, kept for compatibility
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon successful maze generation
+    """
+    return run(wilsons_steps(grid, rng), draw)
+
+
+def hunt_and_kill_steps(grid, rng=random):
     """
     Choose a starting location.
         Perform a random walk, carving passages to unvisited neighbors, until the current cell has no unvisited neighbors.
         Enter “hunt” mode, where you scan the grid looking for an unvisited cell that is adjacent to a visited cell.
         If found, carve a passage between the two and let the formerly unvisited cell be the new starting location.
     Repeat steps 2 and 3 until the hunt mode scans the entire grid and finds no unvisited cells.
+    The hunt keeps a scan position instead of rescanning the grid from the top: every cell before it is visited, and a
+    visited cell stays visited, so it only ever moves forward. The first unvisited cell has a visited cell above it or to
+    its left (the walk starts in the top left corner), so it is always the next cell to hunt from, and all the hunts
+    together take O(n) time, amortized O(1) each.
     :param grid: grid being used
-    :param draw: draws animations to the screen
-    :param rows: Unused: could be used to set a randomized start point, currently using top left corner
+    :param rng: random number generator (random.Random or the random module) used for every random choice
     :return: True upon successful maze creation
     """
-    curr = grid[1][1]
-    unvisited_cells = [node for row in grid for node in row]
-    unvisited_cells.remove(curr)
+    cells = [cell for row in grid for cell in row]
+    curr = cells[0]
+    remaining = len(cells) - 1
+    scan = 0  # scan position (row * cols + col) of the first cell which may still be unvisited
 
-    while len(unvisited_cells) > 0:
+    while remaining > 0:
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
         curr.reset()
         curr.make_visited()
         curr.update_neighbors(grid)
         if len(curr.neighbors) > 0:
-            neighbor = random.choice(curr.neighbors)
+            neighbor = rng.choice(curr.neighbors)
             remove_walls(curr, neighbor)
-            unvisited_cells.remove(neighbor)
+            remaining -= 1
             curr = neighbor
 
         else:
-            for row in grid:
-                curr = None
-                for cell in row:
-                    cell.highlight()
-                    draw()
-                    if cell.is_visited():
-                        cell.update_neighbors(grid)
-                        if len(cell.neighbors) > 0:
-                            curr = random.choice(cell.neighbors)
-                            remove_walls(cell, curr)
-                            unvisited_cells.remove(curr)
-                            cell.reset()
-                            break
-                    cell.reset()
-                if curr is not None:
-                    break
+            while cells[scan].is_visited():
+                scan += 1
+            curr = cells[scan]
+            cell = rng.choice(curr.visited_neighbors(grid))
+            remove_walls(cell, curr)
+            remaining -= 1
+            cell.highlight()
+            yield (cell,)
+            cell.reset()
         curr.highlight()
-        draw()
+        yield (curr,)
         curr.reset()
 
     return True
 
 
-def prims(grid, draw, rows):
+def hunt_and_kill(grid, draw, rows, rng=random):
+    """
+    Blocking version of hunt_and_kill_steps
+    :param grid: grid being used
+    :param draw: draws animations to the screen
+    :param rows: rows in grid: unused, kept for compatibility
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon successful maze generation
+    """
+    return run(hunt_and_kill_steps(grid, rng), draw)
+
+
+def prims_steps(grid, rng=random):
     """
     Prims minimum spanning tree algorithm randomized for maze generation
     SOURCE: Wikipedia
@@ -490,44 +1001,51 @@ def prims(grid, draw, rows):
     Make the wall a passage and mark the unvisited cell as part of the maze.
     Add the neighboring walls of the cell to the wall list.
     Remove the wall from the list.
+    The list holds the unvisited cells next to the maze (each stands for its walls to the maze) in a RandomizedSet, so
+    adding, picking and removing a cell are all O(1) and generation runs in linear time.
     :param grid: grid being used
-    :param draw: draws animations to the screen
-    :param rows: rows in grid
+    :param rng: random number generator (random.Random or the random module) used for every random choice
     :return: True upon maze creation
     """
-    curr = grid[random.randint(0, rows - 1)][random.randint(0, rows - 1)]
+    rows = len(grid)
+    curr = grid[rng.randint(0, rows - 1)][rng.randint(0, len(grid[0]) - 1)]
     curr.make_visited()
     curr.reset()
-    wall_list = {neighbor for neighbor in curr.neighbors}
-    while len(wall_list) > 0:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-        cell = random.sample(wall_list, 1)[0]
+    curr.update_neighbors(grid)
+    frontier = RandomizedSet(curr.neighbors)
+    while len(frontier) > 0:
+        cell = frontier.choice(rng)
+        frontier.remove(cell)
+
+        # every frontier cell borders at least one cell already in the maze
         visited = cell.visited_neighbors(grid)
         cell.make_visited()
         cell.reset()
-        wall_list.remove(cell)
-        if len(visited) > 0:
-            next = random.choice(visited)
-            next.make_visited()
-            next.reset()
-            remove_walls(cell, next)
-            if next in wall_list:
-                wall_list.remove(next)
+        remove_walls(cell, rng.choice(visited))
 
-            cell.update_neighbors(grid)
-            for neighbor in cell.neighbors:
-                wall_list.add(neighbor)
+        cell.update_neighbors(grid)
+        for neighbor in cell.neighbors:
+            frontier.add(neighbor)
         cell.highlight()
-        draw()
-        pygame.time.delay(20)
+        yield (cell,)
         cell.reset()
 
     return True
 
 
-def random_dfs(grid, draw):
+def prims(grid, draw, rows, rng=random):
+    """
+    Blocking version of prims_steps
+    :param grid: grid being used
+    :param draw: draws animations to the screen
+    :param rows: rows in grid: unused, kept for compatibility
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon successful maze generation
+    """
+    return run(prims_steps(grid, rng), draw)
+
+
+def random_dfs_steps(grid, rng=random):
     """
     Random DFS Algorithm (Iterative Implementation:
     Source: Wikipedia
@@ -540,34 +1058,65 @@ def random_dfs(grid, draw):
     Remove the wall between the current cell and the chosen cell
     Mark the chosen cell as visited and push it to the stack
     :param grid: grid being used
-    :param draw: draws animations to the screen
+    :param rng: random number generator (random.Random or the random module) used for every random choice
     :return: True upon successful maze generation
     """
 
-    stack = LifoQueue()
+    stack = LifoFrontier()
     curr = grid[1][1]
     curr.highlight()
     curr.make_visited()
     stack.put(curr)
 
     while not stack.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
         curr.reset()
+        changed = [curr]
         curr = stack.get()
+        changed.append(curr)
         curr.highlight()
         curr.update_neighbors(grid)
-        pygame.time.delay(20)
         if len(curr.neighbors) > 0:
             stack.put(curr)
-            next = random.choice(curr.neighbors)
+            next = rng.choice(curr.neighbors)
             remove_walls(curr, next)
             next.reset()
             next.make_visited()
             stack.put(next)
-        draw()
+            changed.append(next)
+        yield changed
     curr.reset()
 
     return True
+
+
+def random_dfs(grid, draw, rng=random):
+    """
+    Blocking version of random_dfs_steps
+    :param grid: grid being used
+    :param draw: draws animations to the screen
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: True upon successful maze generation
+    """
+    return run(random_dfs_steps(grid, rng), draw)
+
+
+# step generators by name, all taking the same arguments, for the scheduler and benchmarks. Generators also take an
+# optional rng (see farm.py)
+GENERATORS = {
+    "random_dfs": random_dfs_steps,
+    "prims": prims_steps,
+    "kruskals": kruskals_steps,
+    "aldous_broder": aldous_broder_steps,
+    "hunt_and_kill": hunt_and_kill_steps,
+    "wilsons": wilsons_steps,
+}
+
+SOLVERS = {
+    "astar": astar_steps,
+    "dijkstras": dijkstras_steps,
+    "BFS": BFS_steps,
+    "dfs_pathfinder": dfs_pathfinder_steps,
+    "greedy_best_first": greedy_best_first_steps,
+    "bidirectional_BFS": bidirectional_BFS_steps,
+    "bidirectional_astar": bidirectional_astar_steps,
+}
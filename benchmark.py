@@ -0,0 +1,333 @@
+"""
+Headless benchmark runner for every generator and solver in algorithms.py.
+
+Each algorithm is driven through its step generator on a CompactGrid with no drawing and no delays. Every run is
+seeded, so the same command always builds the same mazes. For each (algorithm, rows) pair it records:
+    seconds      wall time of the run
+    peak_bytes   peak traced memory (tracemalloc), measured in a second run so it doesn't slow down the timed one
+    expanded     generators: steps taken, solvers: cells expanded (closed)
+    path_length  solvers only: steps from start to end (start in the top left corner, end in the bottom right)
+
+Results are written as JSON. Passing --baseline compares against a previous results file and exits with status 1 if
+anything regressed.
+
+--distribution instead checks which mazes the given generators produce. It samples many mazes on a tiny grid, runs a
+chi-square goodness of fit test of each generator against the uniform distribution over spanning trees, and a
+chi-square test of homogeneity between the generators. It exits with status 1 if any p-value is below SIGNIFICANCE.
+
+Usage:
+    python benchmark.py --sizes 25 100 500 --output results.json
+    python benchmark.py --sizes 25 100 500 --baseline results.json
+    python benchmark.py --distribution aldous_broder wilsons --samples 20000
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import algorithms
+from compact_grid import CompactGrid, CLOSED, PATH
+
+DEFAULT_SIZES = (25, 50, 100, 200)
+NOISE_SECONDS = 0.01  # timing differences below this are never flagged as regressions
+SIGNIFICANCE = 0.001  # p-values below this fail the distribution check
+
+
+def run_steps(steps, time_limit):
+    """
+    Runs a step generator to completion, giving up after time_limit seconds
+    :param steps: step generator from algorithms.py
+    :param time_limit: seconds, None for no limit
+    :return: (status, steps taken, seconds)
+    """
+    count = 0
+    start = time.perf_counter()
+    deadline = start + time_limit if time_limit else None
+    try:
+        for _ in steps:
+            count += 1
+            # checking the clock every step would dominate the cheaper algorithms
+            if deadline is not None and not count & 1023 and time.perf_counter() > deadline:
+                steps.close()
+                return "timeout", count, time.perf_counter() - start
+    except Exception as error:  # report the failure and keep going with the other algorithms
+        return "error: %s: %s" % (type(error).__name__, error), count, time.perf_counter() - start
+    return "ok", count, time.perf_counter() - start
+
+
+def make_maze(generator, rows, seed):
+    """
+    :param generator: name of a generator in algorithms.GENERATORS
+    :param rows: rows in grid
+    :param seed: random seed
+    :return: CompactGrid holding the generated maze
+    """
+    grid = CompactGrid(rows)
+    algorithms.run(algorithms.GENERATORS[generator](grid, random.Random(seed)), lambda: None)
+    return grid
+
+
+def bench_generator(name, rows, seed, time_limit, memory):
+    def job():
+        grid = CompactGrid(rows)
+        return grid, algorithms.GENERATORS[name](grid, random.Random(seed))
+
+    return _measure(name, "generator", rows, seed, job, time_limit, memory)
+
+
+def bench_solver(name, rows, seed, maze, time_limit, memory):
+    def job():
+        grid = maze.copy()
+        start = grid[0][0]
+        end = grid[rows - 1][rows - 1]
+        start.make_start()
+        end.make_end()
+        return grid, algorithms.SOLVERS[name](grid, start, end)
+
+    return _measure(name, "solver", rows, seed, job, time_limit, memory)
+
+
+def _measure(name, kind, rows, seed, job, time_limit, memory):
+    """
+    Times one run of job(), and optionally traces the memory of a second run
+    :param job: returns (grid, step generator), set up from scratch on every call
+    :return: result dict
+    """
+    grid, steps = job()
+    status, count, seconds = run_steps(steps, time_limit)
+    result = {
+        "algorithm": name,
+        "kind": kind,
+        "rows": rows,
+        "seed": seed,
+        "status": status,
+        "seconds": round(seconds, 6),
+        "peak_bytes": None,
+        "expanded": count,
+        "path_length": None,
+    }
+    if kind == "solver":
+        path = grid.state.count(PATH)
+        result["expanded"] = grid.state.count(CLOSED) + path
+        result["path_length"] = path if status == "ok" else None
+
+    if memory and status == "ok":
+        tracemalloc.start()
+        grid, steps = job()
+        run_steps(steps, None)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(sizes, seed, generators, solvers, maze, time_limit, memory, log=print):
+    """
+    :param sizes: rows for each grid size to benchmark
+    :param seed: base random seed
+    :param generators: generator names to benchmark
+    :param solvers: solver names to benchmark
+    :param maze: generator used to build the mazes the solvers run on
+    :param time_limit: seconds allowed per run, None for no limit
+    :param memory: also measure peak memory
+    :param log: called with a line of text after each run
+    :return: list of result dicts
+    """
+    results = []
+    for rows in sizes:
+        for name in generators:
+            results.append(bench_generator(name, rows, seed, time_limit, memory))
+            log(format_result(results[-1]))
+
+        if solvers:
+            solved_maze = make_maze(maze, rows, seed)
+            for name in solvers:
+                results.append(bench_solver(name, rows, seed, solved_maze, time_limit, memory))
+                log(format_result(results[-1]))
+    return results
+
+
+def format_result(result):
+    memory = "%.1f MB" % (result["peak_bytes"] / 1e6) if result["peak_bytes"] is not None else "-"
+    path = result["path_length"] if result["path_length"] is not None else "-"
+    return "%-20s %6d rows  %10.3fs  %10s  expanded %9d  path %6s  %s" % (
+        result["algorithm"], result["rows"], result["seconds"], memory, result["expanded"], path, result["status"])
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results against a baseline run
+    :param results: list of result dicts
+    :param baseline: list of result dicts from an earlier run
+    :param tolerance: allowed relative slowdown/memory growth, e.g. 0.25 for 25%
+    :return: list of regression descriptions (empty if none)
+    """
+    previous = {(entry["algorithm"], entry["rows"], entry["seed"]): entry for entry in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result["algorithm"], result["rows"], result["seed"]))
+        if old is None:
+            continue
+        label = "%s at %d rows" % (result["algorithm"], result["rows"])
+
+        if old["status"] == "ok" and result["status"] != "ok":
+            regressions.append("%s: %s (was ok)" % (label, result["status"]))
+            continue
+        if result["status"] != "ok" or old["status"] != "ok":
+            continue
+
+        if result["seconds"] - old["seconds"] > max(old["seconds"] * tolerance, NOISE_SECONDS):
+            regressions.append("%s: %.3fs, was %.3fs" % (label, result["seconds"], old["seconds"]))
+        if result["peak_bytes"] and old["peak_bytes"] and result["peak_bytes"] > old["peak_bytes"] * (1 + tolerance):
+            regressions.append("%s: peak memory %d bytes, was %d" % (label, result["peak_bytes"], old["peak_bytes"]))
+        if result["expanded"] > old["expanded"]:
+            regressions.append("%s: expanded %d, was %d" % (label, result["expanded"], old["expanded"]))
+        if old["path_length"] is not None and result["path_length"] > old["path_length"]:
+            regressions.append("%s: path length %d, was %d" % (label, result["path_length"], old["path_length"]))
+    return regressions
+
+
+def sample_mazes(generator, rows, samples, seed):
+    """
+    :param generator: name of a generator in algorithms.GENERATORS
+    :param rows: rows in grid, keep tiny (3 rows has 192 possible mazes)
+    :param samples: number of mazes to generate
+    :param seed: random seed
+    :return: Counter of how often each maze (its wall bytes) came up
+    """
+    rng = random.Random(seed)
+    counts = Counter()
+    for _ in range(samples):
+        grid = CompactGrid(rows)
+        algorithms.run(algorithms.GENERATORS[generator](grid, rng), lambda: None)
+        counts[bytes(grid.walls)] += 1
+    return counts
+
+
+def chi_square_p(statistic, df):
+    """
+    Upper tail probability of the chi-square distribution (Wilson-Hilferty approximation, good for df above ~10)
+    :param statistic: chi-square statistic
+    :param df: degrees of freedom
+    :return: p-value
+    """
+    if df <= 0:
+        return 1.0
+    z = ((statistic / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def uniformity(counts, outcomes):
+    """
+    Chi-square goodness of fit test against the uniform distribution
+    :param counts: Counter of how often each outcome came up
+    :param outcomes: every possible outcome
+    :return: (statistic, degrees of freedom, p-value)
+    """
+    expected = sum(counts.values()) / len(outcomes)
+    statistic = sum((counts[outcome] - expected) ** 2 / expected for outcome in outcomes)
+    df = len(outcomes) - 1
+    return statistic, df, chi_square_p(statistic, df)
+
+
+def homogeneity(tables):
+    """
+    Chi-square test of homogeneity: do the samples come from the same distribution?
+    :param tables: list of Counters, one per sample
+    :return: (statistic, degrees of freedom, p-value)
+    """
+    outcomes = set().union(*tables)
+    totals = [sum(table.values()) for table in tables]
+    grand_total = sum(totals)
+    statistic = 0
+    for outcome in outcomes:
+        column = sum(table[outcome] for table in tables)
+        for table, total in zip(tables, totals):
+            expected = column * total / grand_total
+            statistic += (table[outcome] - expected) ** 2 / expected
+    df = (len(outcomes) - 1) * (len(tables) - 1)
+    return statistic, df, chi_square_p(statistic, df)
+
+
+def distribution_test(generators, rows, samples, seed, log=print):
+    """
+    Checks that each generator produces every maze equally often, and that the generators agree with each other.
+    Mazes never produced by any generator are missed, so samples should be well above the number of possible mazes.
+    :param generators: generator names
+    :param rows: rows in grid
+    :param samples: mazes to generate per generator
+    :param seed: random seed
+    :param log: called with a line of text per test
+    :return: Smallest p-value of all the tests
+    """
+    tables = [sample_mazes(name, rows, samples, seed) for name in generators]
+    outcomes = set().union(*tables)
+    log("%d distinct mazes seen on a %dx%d grid" % (len(outcomes), rows, rows))
+
+    p_values = []
+    for name, table in zip(generators, tables):
+        statistic, df, p = uniformity(table, outcomes)
+        log("%-20s vs uniform:  chi2 %10.1f  df %5d  p %.4f" % (name, statistic, df, p))
+        p_values.append(p)
+    if len(tables) > 1:
+        statistic, df, p = homogeneity(tables)
+        log("%-20s homogeneity: chi2 %10.1f  df %5d  p %.4f" % (" / ".join(generators), statistic, df, p))
+        p_values.append(p)
+    return min(p_values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze generators and solvers headlessly")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="grid sizes (rows) to run")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+    parser.add_argument("--generators", nargs="*", default=list(algorithms.GENERATORS), help="generators to run")
+    parser.add_argument("--solvers", nargs="*", default=list(algorithms.SOLVERS), help="solvers to run")
+    parser.add_argument("--maze", default="kruskals", help="generator used to build the solvers' mazes")
+    parser.add_argument("--time-limit", type=float, default=120, help="seconds allowed per run, 0 for no limit")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON results file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--distribution", nargs="+", metavar="GENERATOR",
+                        help="instead of benchmarking, test these generators' maze distributions")
+    parser.add_argument("--distribution-rows", type=int, default=3, help="grid size for --distribution (default 3)")
+    parser.add_argument("--samples", type=int, default=20000, help="mazes per generator for --distribution")
+    args = parser.parse_args(argv)
+
+    if args.distribution:
+        p = distribution_test(args.distribution, args.distribution_rows, args.samples, args.seed)
+        if p < SIGNIFICANCE:
+            print("FAIL: p-value %.6f is below %g" % (p, SIGNIFICANCE))
+            return 1
+        print("Distributions match")
+        return 0
+
+    results = run_benchmarks(args.sizes, args.seed, args.generators, args.solvers, args.maze,
+                             args.time_limit or None, not args.no_memory)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"], args.tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            return 1
+        print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
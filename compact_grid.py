@@ -0,0 +1,418 @@
+"""
+Compact, array-backed maze grid.
+
+Grid.make_grid builds one Node object per cell, which gets very expensive on large grids. CompactGrid stores the same
+information in three flat bytearrays instead:
+    walls:   4-bit wall mask per cell (bit order matches Node.walls: top, right, bottom, left)
+    state:   small integer code per cell (EMPTY, BARRIER, START, ...) in place of the color tuple
+    visited: 0/1 per cell
+
+Cells are addressed by a flat index, index = row * cols + col, using the same row/col convention as Grid.Node.
+Indexing a CompactGrid (grid[row][col]) returns a lightweight CellView which mimics the Node interface, so the
+generators and solvers in algorithms.py can run on a CompactGrid unchanged.
+"""
+from Grid import Node, mark_dirty, RED, GREEN, BLUE, WHITE, BLACK, ORANGE, TURQUOISE
+
+# wall bits, in the same order as Node.walls
+TOP = 1
+RIGHT = 2
+BOTTOM = 4
+LEFT = 8
+ALL_WALLS = TOP | RIGHT | BOTTOM | LEFT
+WALL_BITS = (TOP, RIGHT, BOTTOM, LEFT)
+OPPOSITE = (2, 3, 0, 1)  # index of the wall on the other side: top <-> bottom, right <-> left
+
+# (row, col) offset of the neighbor behind each wall. Node.x grows with row and Node.y grows with col, so the
+# right wall leads to row + 1 and the bottom wall leads to col + 1
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# cell state codes, stored one byte per cell
+EMPTY = 0
+BARRIER = 1
+START = 2
+END = 3
+OPEN = 4
+CLOSED = 5
+PATH = 6
+
+COLORS = (WHITE, BLACK, ORANGE, TURQUOISE, GREEN, RED, BLUE)
+COLOR_CODES = {color: code for code, color in enumerate(COLORS)}
+
+
+class CompactGrid:
+    def __init__(self, rows, cols=None, gap=1, barrier=True):
+        """
+        :param rows: Rows in grid
+        :param cols: Columns in grid, defaults to rows (square grid)
+        :param gap: Pixel width of a cell, only used for the x/y coordinates of cell views
+        :param barrier: Default True: every cell starts as a barrier with all four walls, like Grid.make_grid
+        """
+        self.rows = rows
+        self.cols = rows if cols is None else cols
+        self.gap = gap
+        size = self.rows * self.cols
+        self.walls = bytearray([ALL_WALLS]) * size if barrier else bytearray(size)
+        self.state = bytearray([BARRIER]) * size if barrier else bytearray(size)
+        self.visited = bytearray(size)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return _RowView(self, row)
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield _RowView(self, row)
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    @property
+    def nbytes(self):
+        """Bytes used by the cell arrays"""
+        return len(self.walls) + len(self.state) + len(self.visited)
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    def node(self, index):
+        """
+        :param index: flat cell index
+        :return: CellView of the cell
+        """
+        return CellView(self, index)
+
+    def neighbor(self, index, direction):
+        """
+        :param index: flat cell index
+        :param direction: wall index (0 top, 1 right, 2 bottom, 3 left)
+        :return: index of the neighbor behind that wall, -1 if it is off the grid
+        """
+        row, col = divmod(index, self.cols)
+        d_row, d_col = DIRECTIONS[direction]
+        row += d_row
+        col += d_col
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return -1
+
+    def has_wall(self, index, direction):
+        return bool(self.walls[index] & WALL_BITS[direction])
+
+    def remove_wall(self, index, direction):
+        """
+        Removes the wall on one side of a cell, and the matching wall of the neighbor behind it
+        :param index: flat cell index
+        :param direction: wall index (0 top, 1 right, 2 bottom, 3 left)
+        :return: None
+        """
+        self.walls[index] &= ~WALL_BITS[direction] & ALL_WALLS
+        other = self.neighbor(index, direction)
+        if other != -1:
+            self.walls[other] &= ~WALL_BITS[OPPOSITE[direction]] & ALL_WALLS
+
+    def paths(self, index):
+        """
+        :param index: flat cell index
+        :return: Indexes of all in-bounds neighbors, walls or not (compact equivalent of Node.update_paths)
+        """
+        cols = self.cols
+        row, col = divmod(index, cols)
+        paths = []
+        if row < self.rows - 1:  # DOWN
+            paths.append(index + cols)
+        if row > 0:  # UP
+            paths.append(index - cols)
+        if col < cols - 1:  # RIGHT
+            paths.append(index + 1)
+        if col > 0:  # LEFT
+            paths.append(index - 1)
+        return paths
+
+    def open_neighbors(self, index):
+        """
+        :param index: flat cell index
+        :return: Indexes of neighbors reachable without crossing a wall or entering a barrier
+        """
+        cols = self.cols
+        walls = self.walls[index]
+        row, col = divmod(index, cols)
+        state = self.state
+        neighbors = []
+        if not walls & RIGHT and row < self.rows - 1 and state[index + cols] != BARRIER:
+            neighbors.append(index + cols)
+        if not walls & LEFT and row > 0 and state[index - cols] != BARRIER:
+            neighbors.append(index - cols)
+        if not walls & BOTTOM and col < cols - 1 and state[index + 1] != BARRIER:
+            neighbors.append(index + 1)
+        if not walls & TOP and col > 0 and state[index - 1] != BARRIER:
+            neighbors.append(index - 1)
+        return neighbors
+
+    def reset_search(self):
+        """Clears visited flags and search colors (open/closed/path), keeping walls, barriers, start and end"""
+        self.visited = bytearray(self.size)
+        self.state = self.state.translate(_CLEAR_SEARCH)
+
+    def copy(self):
+        clone = CompactGrid.__new__(CompactGrid)
+        clone.rows = self.rows
+        clone.cols = self.cols
+        clone.gap = self.gap
+        clone.walls = bytearray(self.walls)
+        clone.state = bytearray(self.state)
+        clone.visited = bytearray(self.visited)
+        return clone
+
+    @classmethod
+    def from_node_grid(cls, grid):
+        """
+        Packs a Grid.make_grid style grid of Nodes into a CompactGrid
+        :param grid: 2D list of Nodes
+        :return: CompactGrid with the same walls, colors and visited flags
+        """
+        rows = len(grid)
+        cols = len(grid[0]) if rows else 0
+        compact = cls(rows, cols, gap=grid[0][0].width if rows else 1, barrier=False)
+        index = 0
+        for row in grid:
+            for node in row:
+                bits = 0
+                for wall, bit in zip(node.walls, WALL_BITS):
+                    if wall:
+                        bits |= bit
+                compact.walls[index] = bits
+                compact.state[index] = COLOR_CODES.get(node.color, EMPTY)
+                compact.visited[index] = node.visited
+                index += 1
+        return compact
+
+    def to_node_grid(self, width):
+        """
+        Unpacks into a Grid.make_grid style grid of Nodes, for display
+        :param width: Width of win
+        :return: 2D list of Nodes
+        """
+        gap = width // self.rows
+        grid = []
+        index = 0
+        for i in range(self.rows):
+            grid.append([])
+            for j in range(self.cols):
+                node = Node(i, j, gap, self.rows)
+                bits = self.walls[index]
+                node.walls = [bool(bits & bit) for bit in WALL_BITS]
+                node.color = COLORS[self.state[index]]
+                node.visited = bool(self.visited[index])
+                grid[i].append(node)
+                index += 1
+        return grid
+
+
+_CLEAR_SEARCH = bytes(EMPTY if code in (OPEN, CLOSED, PATH) else code for code in range(256))
+
+
+class _RowView:
+    __slots__ = ("grid", "row")
+
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.grid.cols:
+            raise IndexError(col)
+        return CellView(self.grid, self.row * self.grid.cols + col)
+
+    def __iter__(self):
+        grid = self.grid
+        start = self.row * grid.cols
+        for index in range(start, start + grid.cols):
+            yield CellView(grid, index)
+
+
+class CellView:
+    """
+    Node-compatible view of a single CompactGrid cell. Views hold no state of their own: two views of the same cell
+    compare and hash equal, so they can be used as dict keys (came_from, g_score, ...) just like Nodes.
+    Unlike Node, neighbors and paths are computed when read instead of being stored by update_neighbors/update_paths.
+    """
+    __slots__ = ("grid", "index")
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, CellView) and other.index == self.index and other.grid is self.grid
+
+    def __hash__(self):
+        return self.index
+
+    def __lt__(self, other):
+        return False
+
+    def __repr__(self):
+        return "CellView(%d, %d)" % self.get_pos()
+
+    @property
+    def row(self):
+        return self.index // self.grid.cols
+
+    @property
+    def col(self):
+        return self.index % self.grid.cols
+
+    @property
+    def x(self):
+        return self.row * self.grid.gap
+
+    @property
+    def y(self):
+        return self.col * self.grid.gap
+
+    @property
+    def width(self):
+        return self.grid.gap
+
+    @property
+    def total_rows(self):
+        return self.grid.rows
+
+    @property
+    def color(self):
+        return COLORS[self.grid.state[self.index]]
+
+    @property
+    def walls(self):
+        bits = self.grid.walls[self.index]
+        return [bool(bits & bit) for bit in WALL_BITS]
+
+    @property
+    def visited(self):
+        return bool(self.grid.visited[self.index])
+
+    @property
+    def neighbors(self):
+        """Non-visited neighbors, as Node.update_neighbors would compute them"""
+        grid = self.grid
+        return [CellView(grid, index) for index in grid.paths(self.index) if not grid.visited[index]]
+
+    @property
+    def paths(self):
+        grid = self.grid
+        return [CellView(grid, index) for index in grid.paths(self.index)]
+
+    def get_pos(self):
+        return divmod(self.index, self.grid.cols)
+
+    def make_walls(self, walls):
+        if walls:
+            self.grid.walls[self.index] = ALL_WALLS
+            mark_dirty(self, walls=True)
+
+    def is_closed(self):
+        return self.grid.state[self.index] == CLOSED
+
+    def is_open(self):
+        return self.grid.state[self.index] == OPEN
+
+    def is_barrier(self):
+        return self.grid.state[self.index] == BARRIER
+
+    def is_start(self):
+        return self.grid.state[self.index] == START
+
+    def is_end(self):
+        return self.grid.state[self.index] == END
+
+    def is_visited(self):
+        return bool(self.grid.visited[self.index])
+
+    def is_wall(self, pos):
+        return bool(self.grid.walls[self.index] & WALL_BITS[pos])
+
+    def remove_wall(self, pos):
+        self.grid.walls[self.index] &= ~WALL_BITS[pos] & ALL_WALLS
+        mark_dirty(self, walls=True)
+
+    def reset(self):
+        self.grid.state[self.index] = EMPTY
+        mark_dirty(self)
+
+    def make_start(self):
+        self.grid.state[self.index] = START
+        mark_dirty(self)
+
+    def make_closed(self):
+        self.grid.state[self.index] = CLOSED
+        mark_dirty(self)
+
+    def make_visited(self):
+        self.grid.visited[self.index] = 1
+
+    def make_unvisited(self):
+        self.grid.visited[self.index] = 0
+
+    def make_open(self):
+        self.grid.state[self.index] = OPEN
+        mark_dirty(self)
+
+    def make_barrier(self):
+        self.grid.state[self.index] = BARRIER
+        mark_dirty(self)
+
+    def make_end(self):
+        self.grid.state[self.index] = END
+        mark_dirty(self)
+
+    def make_path(self):
+        self.grid.state[self.index] = PATH
+        mark_dirty(self)
+
+    def highlight(self):
+        self.grid.state[self.index] = OPEN
+        mark_dirty(self)
+
+    def draw(self, win):
+        import pygame
+
+        pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.width))
+
+    def check_walls(self):
+        return self.walls
+
+    def update_paths(self, grid):
+        """No-op: paths are computed on access"""
+
+    def update_neighbors(self, grid):
+        """No-op: neighbors are computed on access"""
+
+    def visited_neighbors(self, grid):
+        grid = self.grid
+        return [CellView(grid, index) for index in grid.paths(self.index) if grid.visited[index]]
+
+    def get_neighbors(self):
+        return self.neighbors
+
+
+def make_compact_grid(rows, width, barrier=True):
+    """
+    Compact equivalent of Grid.make_grid
+    :param rows: Rows in grid
+    :param width: Width of grid/win
+    :param barrier: Default True: Only false if maze not being generated
+    :return: CompactGrid
+    """
+    # remove_walls/wall_between compare pixel coordinates, so keep cells at least one pixel wide on huge grids
+    return CompactGrid(rows, gap=max(1, width // rows), barrier=barrier)
@@ -0,0 +1,230 @@
+"""
+Corridor contraction: solving on the graph of a maze's junctions instead of its cells.
+
+Generated mazes are mostly corridors: cells with exactly two open neighbors, where a search has no choice to make.
+CorridorGraph contracts every corridor into a single weighted edge between the cells at its ends, the junctions
+(three or more open neighbors) and dead ends (one). Queries run A* on that much smaller graph and then expand each
+edge back into the cells of its corridor, so the result is the same shortest path a search over the cells finds.
+
+Every corridor cell remembers its edge and its position along it, so start and end can be any cell: a cell inside a
+corridor joins the graph through the two ends of its corridor. A closed loop of corridor cells with no junction on it
+gets one of its cells promoted to a junction.
+
+Usage:
+    python corridors.py 300 --generator random_dfs --queries 20
+"""
+import argparse
+import random
+import sys
+import time
+from array import array
+
+import algorithms
+from adjacency import AdjacencyIndex
+from compact_grid import CompactGrid, BARRIER
+
+INF = float("inf")
+
+
+class CorridorGraph:
+    def __init__(self, maze):
+        """
+        :param maze: CompactGrid (see from_grid for Node grids). Walls must match from both sides, as the generators
+        leave them
+        """
+        self.cols = maze.cols
+        size = maze.size
+        self.size = size
+        state = maze.state
+        self.blocked = bytearray(1 if state[index] == BARRIER else 0 for index in range(size))
+        self.links = [[] if self.blocked[index] else maze.open_neighbors(index) for index in range(size)]
+        self.cells = size - sum(self.blocked)
+
+        self.edges = []  # (a, b, corridor cells from a to b, ends excluded)
+        self.adjacent = {}  # junction -> list of (other end, weight, (edge number, True if the edge runs from here))
+        self.edge_of = array("i", [-1]) * size
+        self.offset = array("i", [0]) * size
+
+        for index in range(size):
+            if not self.blocked[index] and len(self.links[index]) != 2:
+                self.adjacent[index] = []
+        for junction in list(self.adjacent):
+            self._walk_from(junction)
+        for index in range(size):
+            # a loop of corridor cells with no junction on it
+            if len(self.links[index]) == 2 and self.edge_of[index] == -1:
+                self.adjacent[index] = []
+                self._walk_from(index)
+
+        self.links = None  # only needed while building
+        self.expanded = 0  # junctions expanded by the last query
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        :param grid: Grid.make_grid style grid of Nodes, or a CompactGrid
+        :return: CorridorGraph
+        """
+        return cls(grid if isinstance(grid, CompactGrid) else CompactGrid.from_node_grid(grid))
+
+    def _walk_from(self, junction):
+        """Follows every corridor leaving junction that has not been walked yet, adding an edge for each"""
+        adjacent = self.adjacent
+        for first in self.links[junction]:
+            if self.edge_of[first] != -1:
+                continue
+            if first in adjacent:
+                # two junctions side by side: an edge with no corridor, added once from the lower index
+                if junction < first:
+                    self._add_edge(junction, first, [])
+                continue
+
+            prev, curr = junction, first
+            cells = []
+            while curr not in adjacent:
+                cells.append(curr)
+                a, b = self.links[curr]
+                prev, curr = curr, (b if a == prev else a)
+            self._add_edge(junction, curr, cells)
+
+    def _add_edge(self, a, b, cells):
+        number = len(self.edges)
+        self.edges.append((a, b, array("i", cells)))
+        for position, cell in enumerate(cells):
+            self.edge_of[cell] = number
+            self.offset[cell] = position
+        weight = len(cells) + 1
+        self.adjacent[a].append((b, weight, (number, True)))
+        if b != a:
+            self.adjacent[b].append((a, weight, (number, False)))
+
+    @property
+    def junctions(self):
+        return len(self.adjacent)
+
+    def stats(self):
+        """
+        :return: dict of cells (open cells of the maze), junctions and edges of the graph, and reduction (cells per
+        junction)
+        """
+        return {"cells": self.cells, "junctions": self.junctions, "edges": len(self.edges),
+                "reduction": self.cells / max(self.junctions, 1)}
+
+    def _attach(self, cell):
+        """
+        :param cell: flat index of an open cell
+        :return: list of (junction, distance, cells from cell up to the junction, junction excluded)
+        """
+        if cell in self.adjacent:
+            return [(cell, 0, [])]
+        a, b, cells = self.edges[self.edge_of[cell]]
+        position = self.offset[cell]
+        return [(a, position + 1, list(cells[position::-1])), (b, len(cells) - position, list(cells[position:]))]
+
+    def path(self, start, end):
+        """
+        Shortest path with A* on the junction graph, expanded back into cells
+        :param start: (row, col) of the start cell
+        :param end: (row, col) of the end cell
+        :return: list of (row, col) from start to end, both included. Empty if there is no path
+        """
+        start = start[0] * self.cols + start[1]
+        end = end[0] * self.cols + end[1]
+        self.expanded = 0
+        if self.blocked[start] or self.blocked[end]:
+            return []
+        if start == end:
+            return [divmod(start, self.cols)]
+
+        best = INF
+        direct = None
+        edge = self.edge_of[start]
+        if edge != -1 and edge == self.edge_of[end]:
+            # both inside the same corridor: walking along it is a candidate
+            cells = self.edges[edge][2]
+            first, last = self.offset[start], self.offset[end]
+            direct = list(cells[first:last + 1] if first <= last else cells[first:last - 1 if last else None:-1])
+            best = len(direct) - 1
+
+        # distance and cells between start or end and each junction they join the graph through
+        sources, origin = {}, {}
+        for junction, distance, cells in self._attach(start):
+            if distance < sources.get(junction, INF):
+                sources[junction] = distance
+                origin[junction] = cells
+        targets, finish = {}, {}
+        for junction, distance, cells in self._attach(end):
+            if distance < targets.get(junction, INF):
+                targets[junction] = distance
+                finish[junction] = cells[::-1]
+
+        best, best_via, came_from, self.expanded = algorithms.graph_astar(sources, targets, self.adjacent.get,
+                                                                          self.cols, end, best)
+
+        if best_via is None:
+            return [divmod(cell, self.cols) for cell in direct] if direct is not None else []
+
+        # expand junction by junction, walking back from the junction the end was reached through
+        cells = [best_via] + finish[best_via]
+        current = best_via
+        while current in came_from:
+            prev, (edge, forward) = came_from[current]
+            corridor = self.edges[edge][2]
+            cells = [prev] + list(corridor if forward else corridor[::-1]) + cells
+            current = prev
+        cells = origin[current] + cells
+        return [divmod(cell, self.cols) for cell in cells]
+
+    def path_steps(self, grid, start, end):
+        """
+        Paints the path from start to end on grid with algorithms.paint_cells_steps
+        :param grid: grid being used (the maze this graph was built from)
+        :param start: start node
+        :param end: end node
+        :return: True if path found, false if no possible path
+        """
+        return (yield from algorithms.paint_cells_steps(grid, self.path(start.get_pos(), end.get_pos()), end))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare A* on the contracted junction graph with A* on the cells")
+    parser.add_argument("rows", type=int, help="grid size (rows and columns)")
+    parser.add_argument("--generator", default="random_dfs", help="maze generator (default random_dfs)")
+    parser.add_argument("--queries", type=int, default=20, help="random start/end pairs to solve (default 20)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default 1)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    grid = CompactGrid(args.rows)
+    algorithms.run(algorithms.GENERATORS[args.generator](grid, rng), lambda: None)
+    grid.reset_search()
+
+    start = time.perf_counter()
+    graph = CorridorGraph(grid)
+    build = time.perf_counter() - start
+    stats = graph.stats()
+    print("%(cells)d cells -> %(junctions)d junctions, %(edges)d edges (%(reduction).1fx smaller)" % stats)
+    print("build: %.3fs" % build)
+
+    queries = [((rng.randrange(args.rows), rng.randrange(args.rows)), (rng.randrange(args.rows),
+                                                                       rng.randrange(args.rows)))
+               for _ in range(args.queries)]
+    start = time.perf_counter()
+    for source, target in queries:
+        graph.path(source, target)
+    contracted = time.perf_counter() - start
+
+    adjacency = AdjacencyIndex(grid)
+    start = time.perf_counter()
+    for source, target in queries:
+        grid.reset_search()
+        steps = algorithms.astar_steps(grid, grid[source[0]][source[1]], grid[target[0]][target[1]], adjacency)
+        algorithms.run(steps, lambda: None)
+    cells = time.perf_counter() - start
+    print("%d queries: %.3fs on the junction graph, %.3fs on the cells (%.1fx faster)"
+          % (len(queries), contracted, cells, cells / contracted))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Streaming maze generation with Eller's algorithm.
+
+The generators in algorithms.py carve a grid that has to be in memory as a whole. Eller's algorithm builds a perfect
+maze one row at a time, remembering only which cells of the current row are already connected (through the rows above
+it), so a maze of any height can be generated in O(cols) memory and written out as it goes.
+
+Rows use the CompactGrid layout: row r is the cells (r, 0) .. (r, cols - 1), and each cell is its 4-bit wall mask, so a
+row is exactly the bytes of CompactGrid.walls[r * cols:(r + 1) * cols]. Cells within a row are joined through their
+bottom/top walls and consecutive rows through their right/left walls (see compact_grid.DIRECTIONS).
+
+Usage:
+    python eller.py 10000 10000000 --seed 1 --output tall.maze
+"""
+import argparse
+import itertools
+import random
+import sys
+
+from compact_grid import CompactGrid, TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS
+from structures import DisjointSet
+
+JOIN_CHANCE = 0.5  # chance of joining two neighboring cells of a row that are in different sets
+CARVE_CHANCE = 0.5  # chance of carving a passage from a cell into the next row (at least one per set is always carved)
+
+
+def eller_rows(cols, rows, join_chance=JOIN_CHANCE, rng=random):
+    """
+    Eller's Algorithm: generates a perfect maze row by row.
+    For each row:
+      Put each cell that has no passage from the row above into a set of its own.
+      Randomly join neighboring cells that are in different sets, merging their sets.
+      Carve at least one passage down into the next row from every set, at random. Cells below a passage join its set.
+    In the last row, join every pair of neighboring cells that are still in different sets.
+    Only the current row's sets are kept, in a DisjointSet over its columns.
+    :param cols: cells per row
+    :param rows: number of rows
+    :param join_chance: chance of joining two neighboring cells in different sets
+    :param rng: random number generator (random.Random or the random module) used for every random choice
+    :return: Iterator of bytes, one per row, holding each cell's wall mask
+    """
+    carried = [-1] * cols  # set each cell was carried into from the row above, -1 for a new set of its own
+
+    for row in range(rows):
+        sets = DisjointSet(cols)
+        first = {}
+        walls = bytearray([ALL_WALLS]) * cols
+        for col, label in enumerate(carried):
+            if label < 0:
+                continue
+            walls[col] &= ~LEFT
+            if label in first:
+                sets.union(first[label], col)
+            else:
+                first[label] = col
+
+        last = row == rows - 1
+        for col in range(cols - 1):
+            if (last or rng.random() < join_chance) and sets.union(col, col + 1):
+                walls[col] &= ~BOTTOM
+                walls[col + 1] &= ~TOP
+
+        if not last:
+            members = {}
+            for col in range(cols):
+                members.setdefault(sets.find(col), []).append(col)
+
+            carried = [-1] * cols
+            for label, cells in members.items():
+                down = [col for col in cells if rng.random() < CARVE_CHANCE]
+                if not down:
+                    down = [rng.choice(cells)]
+                for col in down:
+                    walls[col] &= ~RIGHT
+                    carried[col] = label
+
+        yield bytes(walls)
+
+
+def write_rows(file, stream):
+    """
+    :param file: binary file (or socket.makefile("wb")) to write to
+    :param stream: iterator of rows, e.g. eller_rows(cols, rows)
+    :return: Number of rows written
+    """
+    count = 0
+    for walls in stream:
+        file.write(walls)
+        count += 1
+    return count
+
+
+def read_rows(file, cols):
+    """
+    :param file: binary file written by write_rows
+    :param cols: cells per row
+    :return: Iterator of rows, read one at a time
+    """
+    while True:
+        walls = file.read(cols)
+        if not walls:
+            return
+        if len(walls) < cols:
+            raise ValueError("truncated row: %d of %d cells" % (len(walls), cols))
+        yield walls
+
+
+def load_window(stream, first_row, size, first_col=0):
+    """
+    Loads a square window of a streamed maze into a CompactGrid. Only the rows up to the end of the window are read.
+    Passages which lead out of the window are left open.
+    :param stream: iterator of rows, e.g. eller_rows(cols, rows) or read_rows(file, cols)
+    :param first_row: first row of the window
+    :param size: rows and columns in the window
+    :param first_col: first column of the window
+    :raises ValueError: if the stream ends before the window does
+    :return: CompactGrid holding the window
+    """
+    grid = CompactGrid(size, barrier=False)
+    loaded = 0
+    for walls in itertools.islice(stream, first_row, first_row + size):
+        window = walls[first_col:first_col + size]
+        if len(window) < size:
+            raise ValueError("rows are only %d cells wide" % len(walls))
+        grid.walls[loaded * size:(loaded + 1) * size] = window
+        loaded += 1
+    if loaded < size:
+        raise ValueError("stream ended after %d of the window's %d rows" % (loaded, size))
+    return grid
+
+
+def load_node_window(stream, first_row, size, width, first_col=0):
+    """
+    Loads a square window of a streamed maze into a Grid.make_grid style grid of Nodes, for display
+    :param stream: iterator of rows
+    :param first_row: first row of the window
+    :param size: rows and columns in the window
+    :param width: Width of win
+    :param first_col: first column of the window
+    :return: 2D list of Nodes
+    """
+    return load_window(stream, first_row, size, first_col).to_node_grid(width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a maze generated with Eller's algorithm, one row at a time")
+    parser.add_argument("cols", type=int, help="cells per row")
+    parser.add_argument("rows", type=int, help="number of rows")
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument("--output", help="file to write the rows to (default stdout)")
+    args = parser.parse_args(argv)
+
+    stream = eller_rows(args.cols, args.rows, rng=random.Random(args.seed))
+    if args.output:
+        with open(args.output, "wb") as file:
+            write_rows(file, stream)
+    else:
+        write_rows(sys.stdout.buffer, stream)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Batch maze generation over a process pool.
+
+A job is a (generator, rows, seed) tuple. Every job builds its maze on a CompactGrid with its own random.Random(seed),
+so a maze depends only on its job, never on which worker ran it or what ran before it: rerunning any job, alone or in
+another batch, rebuilds the same maze. Workers pack each maze into the maze file format before sending it back, and
+the mazes are appended to the output (a corpus file, read back with maze_file.read_mazes) as soon as they complete, in
+completion order. Each record carries its generator and seed.
+
+Usage:
+    python farm.py --generators kruskals prims --sizes 50 100 --count 1000 --output corpus.maze
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+
+import algorithms
+import maze_file
+from compact_grid import CompactGrid
+
+
+def generate(job):
+    """
+    Builds one maze. Runs in the worker processes
+    :param job: (generator name, rows, seed)
+    :return: bytes of the maze in the maze file format
+    """
+    generator, rows, seed = job
+    grid = CompactGrid(rows)
+    algorithms.run(algorithms.GENERATORS[generator](grid, random.Random(seed)), lambda: None)
+    return maze_file.pack_maze(grid, generator, seed)
+
+
+def make_jobs(generators, sizes, count, seed=0):
+    """
+    :param generators: generator names
+    :param sizes: rows for each grid size
+    :param count: mazes per (generator, size)
+    :param seed: first seed, the mazes of each (generator, size) use seeds seed .. seed + count - 1
+    :return: list of jobs
+    """
+    return [(generator, rows, seed + i) for generator in generators for rows in sizes for i in range(count)]
+
+
+def run_farm(jobs, output, processes=None, chunksize=1):
+    """
+    :param jobs: iterable of (generator name, rows, seed)
+    :param output: corpus file to write the mazes to
+    :param processes: worker processes, defaults to the number of cores. 1 generates in this process, without a pool
+    :param chunksize: jobs handed to a worker at a time, raise it for many small mazes
+    :return: Number of mazes written
+    """
+    count = 0
+    with open(output, "wb") as file:
+        if processes == 1:
+            for job in jobs:
+                file.write(generate(job))
+                count += 1
+            return count
+
+        with multiprocessing.Pool(processes) as pool:
+            for record in pool.imap_unordered(generate, jobs, chunksize):
+                file.write(record)
+                count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a corpus of mazes over a process pool")
+    parser.add_argument("--generators", nargs="+", default=list(algorithms.GENERATORS), help="generators to use")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50], help="grid sizes (rows)")
+    parser.add_argument("--count", type=int, default=100, help="mazes per generator and size")
+    parser.add_argument("--seed", type=int, default=0, help="first seed (default 0)")
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--chunksize", type=int, default=1, help="jobs handed to a worker at a time")
+    parser.add_argument("--output", default="corpus.maze", help="corpus file to write (default corpus.maze)")
+    args = parser.parse_args(argv)
+
+    jobs = make_jobs(args.generators, args.sizes, args.count, args.seed)
+    start = time.perf_counter()
+    count = run_farm(jobs, args.output, args.processes, args.chunksize)
+    seconds = time.perf_counter() - start
+    print("%d mazes in %.2fs (%.1f mazes/s) written to %s" % (count, seconds, count / seconds, args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
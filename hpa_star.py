@@ -0,0 +1,350 @@
+"""
+Hierarchical pathfinding (HPA*) for very large grids.
+
+Even a good A* expands a large share of the cells of a big grid. HPA* splits the grid into square clusters and
+precomputes a small abstract graph over them:
+    entrances  Where two neighboring clusters touch, the open crossings along their shared border are split into runs
+               (a run ends at a wall or barrier on either side, so each side of a run is connected along the border).
+               The middle crossing of every run becomes a pair of abstract nodes, one on each side, joined by an edge
+               of weight 1.
+    intra      Within each cluster, a breadth first search from every entrance gives its distance to every other
+               entrance of the cluster it can reach, an edge of the abstract graph.
+A query connects start and end to the entrances of their own clusters, runs A* on the abstract graph and then refines
+each abstract step into cells with a search confined to one cluster. Paths are near optimal rather than shortest:
+they cross each border run at its middle.
+
+Editing a cell only changes its own cluster and the borders it lies on, so update() rebuilds the entrances of those
+borders and the intra edges of the clusters they touch (at most three clusters) and nothing else.
+
+source: Botea, Müller and Schaeffer, "Near Optimal Hierarchical Path-Finding", Journal of Game Development 1 (2004)
+
+Usage:
+    python hpa_star.py 1000 --cluster-size 16 --queries 10
+"""
+import argparse
+import random
+import sys
+import time
+from collections import deque
+
+import algorithms
+from adjacency import AdjacencyIndex
+from compact_grid import CompactGrid, WALL_BITS, BARRIER, EMPTY, PATH, RIGHT, BOTTOM
+
+INF = float("inf")
+CLUSTER_SIZE = 16
+
+
+class HPAStar:
+    def __init__(self, maze, cluster_size=CLUSTER_SIZE):
+        """
+        :param maze: CompactGrid (see from_grid for Node grids), kept and updated by update(). Walls must match from
+        both sides, as the generators leave them
+        :param cluster_size: rows and columns of cells per cluster
+        """
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-maze.rows // cluster_size)
+        self.cluster_cols = -(-maze.cols // cluster_size)
+        self.crossings = {}  # (cluster, neighbor cluster to the right or below) -> list of (cell, cell) crossings
+        self.inter = {}  # entrance -> list of entrances across a border
+        self.intra = {}  # entrance -> list of (entrance of the same cluster, distance)
+        self.entrances = {}  # cluster -> set of its entrances
+        self.rebuilt = 0  # clusters rebuilt by the last update
+        self.expanded = 0  # abstract nodes expanded by the last query
+
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            for neighbor in self._next_clusters(cluster):
+                self._build_border(cluster, neighbor)
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            self._build_cluster(cluster)
+
+    @classmethod
+    def from_grid(cls, grid, cluster_size=CLUSTER_SIZE):
+        """
+        :param grid: Grid.make_grid style grid of Nodes, or a CompactGrid
+        :param cluster_size: rows and columns of cells per cluster
+        :return: HPAStar over a CompactGrid copy of the grid's walls and barriers
+        """
+        maze = grid.copy() if isinstance(grid, CompactGrid) else CompactGrid.from_node_grid(grid)
+        maze.reset_search()
+        return cls(maze, cluster_size)
+
+    def cluster_of(self, index):
+        row, col = divmod(index, self.maze.cols)
+        return row // self.cluster_size * self.cluster_cols + col // self.cluster_size
+
+    def _next_clusters(self, cluster):
+        """Neighbors of a cluster one cluster row down (higher row) and one cluster column right (higher col)"""
+        c_row, c_col = divmod(cluster, self.cluster_cols)
+        if c_row + 1 < self.cluster_rows:
+            yield cluster + self.cluster_cols
+        if c_col + 1 < self.cluster_cols:
+            yield cluster + 1
+
+    def _open(self, index, bit):
+        """True if the cell is not a barrier and its wall on that side is open"""
+        return self.maze.state[index] != BARRIER and not self.maze.walls[index] & bit
+
+    def _build_border(self, cluster, neighbor):
+        """Finds the entrances between cluster and the neighbor below it (next cluster row) or to its right"""
+        maze = self.maze
+        size = self.cluster_size
+        c_row, c_col = divmod(cluster, self.cluster_cols)
+        if neighbor == cluster + self.cluster_cols:
+            # border between the last row of cluster and the first row of neighbor, running along the columns
+            row = c_row * size + size - 1
+            cells = [(row * maze.cols + col, (row + 1) * maze.cols + col)
+                     for col in range(c_col * size, min((c_col + 1) * size, maze.cols))]
+            cross, along = RIGHT, BOTTOM
+        else:
+            col = c_col * size + size - 1
+            cells = [(row * maze.cols + col, row * maze.cols + col + 1)
+                     for row in range(c_row * size, min((c_row + 1) * size, maze.rows))]
+            cross, along = BOTTOM, RIGHT
+        back = WALL_BITS[(WALL_BITS.index(cross) + 2) % 4]
+
+        for a, b in self.crossings.pop((cluster, neighbor), []):
+            self.inter[a].remove(b)
+            self.inter[b].remove(a)
+
+        # split the open crossings into runs, ending a run wherever either side can't move along the border
+        runs = []
+        run = []
+        for position, (a, b) in enumerate(cells):
+            if self._open(a, cross) and self._open(b, back):
+                previous_a, previous_b = cells[position - 1]
+                if run and not (self._open(previous_a, along) and self._open(previous_b, along)):
+                    runs.append(run)
+                    run = []
+                run.append((a, b))
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+
+        crossings = [run[len(run) // 2] for run in runs]
+        self.crossings[(cluster, neighbor)] = crossings
+        for a, b in crossings:
+            self.inter.setdefault(a, []).append(b)
+            self.inter.setdefault(b, []).append(a)
+
+    def _borders(self, cluster):
+        """Keys of self.crossings for the up to four borders of a cluster"""
+        c_row, c_col = divmod(cluster, self.cluster_cols)
+        if c_row > 0:
+            yield cluster - self.cluster_cols, cluster
+        if c_col > 0:
+            yield cluster - 1, cluster
+        for neighbor in self._next_clusters(cluster):
+            yield cluster, neighbor
+
+    def _build_cluster(self, cluster):
+        """Recomputes the entrances of a cluster and the distances between them"""
+        for entrance in self.entrances.pop(cluster, ()):
+            self.intra.pop(entrance, None)
+            if not self.inter.get(entrance):
+                self.inter.pop(entrance, None)
+
+        entrances = set()
+        for border in self._borders(cluster):
+            for a, b in self.crossings[border]:
+                entrances.add(a if self.cluster_of(a) == cluster else b)
+        self.entrances[cluster] = entrances
+        for entrance in entrances:
+            distances = self._local_distances(entrance)
+            self.intra[entrance] = [(other, distances[other]) for other in entrances
+                                    if other != entrance and other in distances]
+
+    def _local_distances(self, source):
+        """
+        :param source: flat index of a cell
+        :return: dict of the distance from source to every cell of its cluster reachable without leaving it
+        """
+        cluster = self.cluster_of(source)
+        maze = self.maze
+        distances = {source: 0}
+        queue = deque([source])
+        while queue:
+            cell = queue.popleft()
+            for neighbor in maze.open_neighbors(cell):
+                if neighbor not in distances and self.cluster_of(neighbor) == cluster:
+                    distances[neighbor] = distances[cell] + 1
+                    queue.append(neighbor)
+        return distances
+
+    def _local_path(self, source, target):
+        """
+        :return: list of flat indexes from source to target, both included, without leaving their cluster
+        """
+        cluster = self.cluster_of(source)
+        maze = self.maze
+        came_from = {source: None}
+        queue = deque([source])
+        while queue and target not in came_from:
+            cell = queue.popleft()
+            for neighbor in maze.open_neighbors(cell):
+                if neighbor not in came_from and self.cluster_of(neighbor) == cluster:
+                    came_from[neighbor] = cell
+                    queue.append(neighbor)
+        path = []
+        cell = target
+        while cell is not None:
+            path.append(cell)
+            cell = came_from[cell]
+        path.reverse()
+        return path
+
+    def update(self, node):
+        """
+        Copies an edited node (made a barrier or erased) into the maze and rebuilds the clusters it affects
+        :param node: edited Node (or CellView)
+        :return: None
+        """
+        maze = self.maze
+        index = maze.index(node.row, node.col)
+        maze.state[index] = BARRIER if node.is_barrier() else EMPTY
+        bits = 0
+        for wall, bit in zip(node.walls, WALL_BITS):
+            if wall:
+                bits |= bit
+        maze.walls[index] = bits
+
+        cluster = self.cluster_of(index)
+        clusters = {cluster}
+        neighbors = [maze.neighbor(index, direction) for direction in range(4)]
+        for border in list(self._borders(cluster)):
+            other = border[0] if border[1] == cluster else border[1]
+            # only the borders the cell lies on change
+            if any(neighbor != -1 and self.cluster_of(neighbor) == other for neighbor in neighbors):
+                self._build_border(*border)
+                clusters.add(other)
+        for changed in clusters:
+            self._build_cluster(changed)
+        self.rebuilt = len(clusters)
+
+    def _edges(self, entrance):
+        """(entrance, distance, None) for every abstract edge leaving an entrance, for algorithms.graph_astar"""
+        return [(other, distance, None) for other, distance in self.intra[entrance]] + \
+            [(other, 1, None) for other in self.inter.get(entrance, ())]
+
+    def path(self, start, end):
+        """
+        Near optimal path: A* over the abstract graph, refined into cells one cluster at a time
+        :param start: (row, col) of the start cell
+        :param end: (row, col) of the end cell
+        :return: list of (row, col) from start to end, both included. Empty if there is no path
+        """
+        maze = self.maze
+        start = maze.index(*start)
+        end = maze.index(*end)
+        self.expanded = 0
+        if maze.state[start] == BARRIER or maze.state[end] == BARRIER:
+            return []
+
+        # connect start and end to the entrances of their clusters
+        from_start = self._local_distances(start)
+        to_end = self._local_distances(end)
+        sources = {entrance: from_start[entrance] for entrance in self.entrances[self.cluster_of(start)]
+                   if entrance in from_start}
+        targets = {entrance: to_end[entrance] for entrance in self.entrances[self.cluster_of(end)]
+                   if entrance in to_end}
+        # within one cluster, the local path is a candidate
+        best, best_via, came_from, self.expanded = algorithms.graph_astar(sources, targets, self._edges, maze.cols,
+                                                                          end, from_start.get(end, INF))
+
+        if best == INF:
+            return []
+        if best_via is None:
+            cells = self._local_path(start, end)
+        else:
+            abstract = [end, best_via]
+            while abstract[-1] in came_from:
+                abstract.append(came_from[abstract[-1]][0])
+            abstract.append(start)
+            abstract.reverse()
+
+            # refine: entrances either sit across a border from each other or in the same cluster
+            cells = [start]
+            for a, b in zip(abstract, abstract[1:]):
+                if a == b:
+                    continue
+                if b in self.inter.get(a, ()) and self.cluster_of(a) != self.cluster_of(b):
+                    cells.append(b)
+                else:
+                    cells.extend(self._local_path(a, b)[1:])
+        return [maze.position(cell) for cell in cells]
+
+    def path_steps(self, grid, start, end):
+        """
+        Paints the path from start to end on grid with algorithms.paint_cells_steps
+        :param grid: grid being used (the maze this was built from)
+        :param start: start node
+        :param end: end node
+        :return: True if path found, false if no possible path
+        """
+        return (yield from algorithms.paint_cells_steps(grid, self.path(start.get_pos(), end.get_pos()), end))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare HPA* with A* on a large maze")
+    parser.add_argument("rows", type=int, help="grid size (rows and columns)")
+    parser.add_argument("--cluster-size", type=int, default=CLUSTER_SIZE, help="cells per cluster side")
+    parser.add_argument("--generator", default="none", help="maze generator, 'none' (default) for an open grid "
+                                                            "with random barriers")
+    parser.add_argument("--queries", type=int, default=10, help="random start/end pairs to solve (default 10)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default 1)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    if args.generator == "none":
+        grid = CompactGrid(args.rows, barrier=False)
+        for index in range(grid.size):
+            if rng.random() < 0.2:
+                grid.state[index] = BARRIER
+    else:
+        grid = CompactGrid(args.rows)
+        algorithms.run(algorithms.GENERATORS[args.generator](grid, rng), lambda: None)
+        grid.reset_search()
+
+    start = time.perf_counter()
+    hpa = HPAStar(grid, args.cluster_size)
+    print("build: %.2fs, %d clusters, %d abstract nodes"
+          % (time.perf_counter() - start, len(hpa.entrances), len(hpa.intra)))
+
+    queries = []
+    while len(queries) < args.queries:
+        source, target = rng.randrange(grid.size), rng.randrange(grid.size)
+        if grid.state[source] != BARRIER and grid.state[target] != BARRIER:
+            queries.append((grid.position(source), grid.position(target)))
+
+    start = time.perf_counter()
+    lengths = [len(hpa.path(source, target)) - 1 for source, target in queries]
+    hierarchical = time.perf_counter() - start
+
+    adjacency = AdjacencyIndex(grid)
+    optimal = []
+    start = time.perf_counter()
+    for source, target in queries:
+        grid.reset_search()
+        algorithms.run(algorithms.astar_steps(grid, grid[source[0]][source[1]], grid[target[0]][target[1]],
+                                              adjacency), lambda: None)
+        optimal.append(grid.state.count(PATH))
+    flat = time.perf_counter() - start
+
+    found = [(length, best) for length, best in zip(lengths, optimal) if length > 0]
+    excess = sum(length for length, _ in found) / max(sum(best for _, best in found), 1) - 1
+    print("%d queries: HPA* %.3fs, A* %.3fs (%.1fx faster), paths %.1f%% longer than shortest"
+          % (len(queries), hierarchical, flat, flat / hierarchical, excess * 100))
+
+    cell = grid.node(rng.randrange(grid.size))
+    cell.make_barrier()
+    start = time.perf_counter()
+    hpa.update(cell)
+    print("update after one barrier edit: %.4fs, %d clusters rebuilt" % (time.perf_counter() - start, hpa.rebuilt))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Incremental replanning with Lifelong Planning A* (LPA*).
+
+astar starts from nothing on every call. LPAStar keeps its search between queries: g (the best known cost from start)
+and rhs (the one step lookahead cost, the lowest g of a neighbor plus one) of every cell it has looked at. A cell is
+consistent when g == rhs, and only inconsistent cells are in the queue. When a cell becomes or stops being a barrier,
+only that cell and its neighbors are updated; the search then repairs just the costs the change actually affects and
+stops as soon as the end cell is consistent again. An edit far from the path costs a handful of expansions, whatever
+the size of the grid.
+
+Start and end are fixed for the life of a planner (D* Lite's moving start is not needed here: the start only changes
+when the user picks a new one, and then a new planner is made). Costs are kept in dicts that only hold cells the
+search has reached, so making a planner is O(1).
+
+source: Koenig, Likhachev and Furcy, "Lifelong Planning A*", Artificial Intelligence 155 (2004)
+"""
+from heapq import heappush, heappop
+
+from algorithms import h
+from compact_grid import DIRECTIONS
+
+INF = float("inf")
+
+
+class LPAStar:
+    def __init__(self, grid, start, end):
+        """
+        :param grid: grid being used
+        :param start: start node
+        :param end: end node
+        """
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.start = start.get_pos()
+        self.end = end.get_pos()
+        self.g = {}
+        self.rhs = {self.start: 0}
+        self.queue = []
+        self.queued = {}  # cell -> its key in the queue, entries in the heap with any other key are stale
+        self.blocked = {node.get_pos() for row in grid for node in row if node.is_barrier()}
+        self.expanded = 0  # cells expanded by the last call to compute
+        self._push(self.start)
+
+    def _key(self, pos):
+        cost = min(self.g.get(pos, INF), self.rhs.get(pos, INF))
+        return cost + h(pos, self.end), cost
+
+    def _push(self, pos):
+        key = self._key(pos)
+        self.queued[pos] = key
+        heappush(self.queue, (key, pos))
+
+    def neighbors(self, pos):
+        """
+        :param pos: (row, col) of a cell
+        :return: (row, col) of the neighbors reachable in one step, empty for a barrier
+        """
+        if pos in self.blocked:
+            return []
+        row, col = pos
+        walls = self.grid[row][col].walls
+        neighbors = []
+        for direction, (d_row, d_col) in enumerate(DIRECTIONS):
+            neighbor = (row + d_row, col + d_col)
+            if (not walls[direction] and 0 <= neighbor[0] < self.rows and 0 <= neighbor[1] < self.cols
+                    and neighbor not in self.blocked):
+                neighbors.append(neighbor)
+        return neighbors
+
+    def _update(self, pos):
+        """Recomputes rhs of a cell from its neighbors, and queues it if it is inconsistent"""
+        if pos != self.start:
+            self.rhs[pos] = min((self.g.get(neighbor, INF) + 1 for neighbor in self.neighbors(pos)), default=INF)
+        self.queued.pop(pos, None)
+        if self.g.get(pos, INF) != self.rhs.get(pos, INF):
+            self._push(pos)
+
+    def _top_key(self):
+        """
+        :return: Lowest key in the queue, dropping stale entries on the way
+        """
+        queue = self.queue
+        while queue and self.queued.get(queue[0][1]) != queue[0][0]:
+            heappop(queue)
+        return queue[0][0] if queue else (INF, INF)
+
+    def compute(self):
+        """
+        Repairs the search until the end cell's cost is known
+        :return: True if there is a path from start to end
+        """
+        self.expanded = 0
+        end = self.end
+        while self._top_key() < self._key(end) or self.rhs.get(end, INF) != self.g.get(end, INF):
+            _, pos = heappop(self.queue)
+            del self.queued[pos]
+            self.expanded += 1
+            if self.g.get(pos, INF) > self.rhs[pos]:
+                # overconsistent: its cost went down, settle it
+                self.g[pos] = self.rhs[pos]
+            else:
+                # underconsistent: its cost went up, forget it and let its neighbors offer a new one
+                self.g[pos] = INF
+                self._update(pos)
+            for neighbor in self.neighbors(pos):
+                self._update(neighbor)
+        return self.g.get(end, INF) < INF
+
+    def set_blocked(self, pos, blocked):
+        """
+        Records a cell becoming or no longer being a barrier. Call compute afterwards to repair the search
+        :param pos: (row, col) of the cell
+        :param blocked: True if the cell is now a barrier
+        :return: True if that changed anything
+        """
+        if blocked == (pos in self.blocked):
+            return False
+        # neighbors gain or lose an edge either way, their rhs has to be recomputed on the old and the new edges
+        row, col = pos
+        affected = [pos] + [(row + d_row, col + d_col) for d_row, d_col in DIRECTIONS
+                            if 0 <= row + d_row < self.rows and 0 <= col + d_col < self.cols]
+        if blocked:
+            self.blocked.add(pos)
+        else:
+            self.blocked.discard(pos)
+        for cell in affected:
+            self._update(cell)
+        return True
+
+    def update(self, node):
+        """
+        Replans after a node was edited (made a barrier or erased)
+        :param node: edited node
+        :return: True if there is a path from start to end
+        """
+        self.set_blocked(node.get_pos(), node.is_barrier())
+        return self.compute()
+
+    def path(self):
+        """
+        :return: (row, col) of every cell on the shortest path from start to end, both included. Empty if there is none
+        """
+        g = self.g
+        pos = self.end
+        if g.get(pos, INF) == INF:
+            return []
+        cells = [pos]
+        while pos != self.start:
+            pos = min(self.neighbors(pos), key=lambda neighbor: g.get(neighbor, INF))
+            cells.append(pos)
+        cells.reverse()
+        return cells
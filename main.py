@@ -1,6 +1,12 @@
 import pygame
 import algorithms
 import Grid
+import maze_file
+from adjacency import AdjacencyIndex
+from hpa_star import HPAStar
+from lpa_star import LPAStar
+from path_cache import PathCache, cell_key
+from scheduler import Scheduler
 
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
@@ -15,9 +21,12 @@ TURQUOISE = (64, 224, 208)
 
 WIDTH = 600 + 6
 WALL_WIDTH = 5
-WIN = pygame.display.set_mode((WIDTH, WIDTH))
-pygame.display.set_caption("Maze Generation & Path Finding Algorithm Visualizer")
-pygame.init()
+FPS = 60
+
+MAZE_FILE = "maze.maze"  # where S saves the maze and L loads it from
+HPA_CLUSTER_SIZE = 5  # cells per cluster side for hierarchical pathfinding (P)
+
+SOLVER_KEYS = (pygame.K_q, pygame.K_w, pygame.K_e, pygame.K_r, pygame.K_t, pygame.K_y, pygame.K_u)
 
 
 def print_help():
@@ -28,15 +37,91 @@ def print_help():
           "Press 2 to Generate a Maze Using Prims Algorithm\n"
           "Press 3 to Generate a Maze Using Kruskal's Algorithm\n"
           "Press 4 to Generate a Maze Using The Aldous Broder Algorithm\n"
-          "Press 5 to Generate a Maze Using The Hunt and Kill Algorithm\n\n"
-          "Press N to Not Generate a maze and draw the Barricades Yourself\n\n"
+          "Press 5 to Generate a Maze Using The Hunt and Kill Algorithm\n"
+          "Press 6 to Generate a Maze Using Wilson's Algorithm\n\n"
+          "Press N to Not Generate a maze and draw the Barricades Yourself\n"
+          "Press L to Load the Maze Saved in %s\n\n"
+          "After a maze has been generated...\n"
+          "Press S to Save the Maze to %s\n\n"
           "After a Start and End have been defined using left mouse...\n"
           "Press Q To Solve the Maze Using A* Search\n"
           "Press W To Solve the Maze Using Dijkstra's Algorithm\n"
           "Press E To Solve the Maze Using BFS\n"
           "Press R To solve the Maze Using DFS\n"
           "Press T To Solve the Maze Using Greedy Best-First Search.\n"
-          )
+          "Press Y To Solve the Maze Using Bidirectional BFS\n"
+          "Press U To Solve the Maze Using Bidirectional A* Search\n"
+          "Press J To Find a Path Using Jump Point Search (Only After Pressing N)\n"
+          "Press I To Plan a Path Incrementally, Updated Live as Barriers are Drawn or Erased\n"
+          "Press P To Find a Path Using Hierarchical Pathfinding (HPA*)\n"
+          "Solving the Same Maze, Start and End Again Shows the Cached Path Straight Away\n\n"
+          "While an algorithm is running...\n"
+          "Press Up/Down to Speed Up/Slow Down the Animation\n"
+          "Press Space to Pause/Resume, and Right Arrow to Advance One Step While Paused\n"
+          "Press Escape to Cancel\n"
+          % (MAZE_FILE, MAZE_FILE))
+
+
+def clear_search(grid, start, end):
+    """
+    Resets the cells colored by a previous search, so the maze can be solved again
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :return: None
+    """
+    for row in grid:
+        for node in row:
+            if node.is_open() or node.is_closed() or node.color == BLUE:
+                node.reset()
+    start.make_start()
+    end.make_end()
+
+
+def solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint):
+    """
+    Shows the cached path if this maze was already solved from start to end, otherwise starts solving it
+    :param scheduler: Scheduler to run the solver on
+    :param path_cache: PathCache of solved paths
+    :param solver: name of a solver in algorithms.SOLVERS
+    :param grid: grid being used
+    :param start: starting node
+    :param end: target end node
+    :param adjacency: AdjacencyIndex of the grid
+    :param fingerprint: fingerprint of the maze kept up to date through edits, None to take it from the grid
+    :return: (fingerprint of the maze, whether the cached path was found or False while solving)
+    """
+    clear_search(grid, start, end)
+    if fingerprint is None:
+        fingerprint = path_cache.fingerprint(grid)
+    cached = path_cache.get(fingerprint, start.get_pos(), end.get_pos(), solver)
+    if cached is None:
+        scheduler.start(algorithms.SOLVERS[solver](grid, start, end, adjacency), "path")
+        return fingerprint, False
+
+    found, cells = cached
+    for row, col in cells:
+        grid[row][col].make_path()
+    print("Path from cache (%(hits)d hits, %(misses)d misses)" % path_cache.info())
+    return fingerprint, found
+
+
+def show_plan(grid, planner, shown):
+    """
+    Paints the incremental planner's path, erasing the cells of the previously shown path that are no longer on it
+    :param grid: grid being used
+    :param planner: LPAStar planner
+    :param shown: (row, col) of the cells painted for the previous path
+    :return: (row, col) of the cells painted now
+    """
+    cells = planner.path()[1:-1]
+    keep = set(cells)
+    for row, col in shown:
+        if (row, col) not in keep and grid[row][col].color == BLUE:
+            grid[row][col].reset()
+    for row, col in cells:
+        grid[row][col].make_path()
+    return cells
 
 
 def main(win, width):
@@ -53,144 +138,292 @@ def main(win, width):
     start = None
     end = None
     maze = False
+    generator = ""
     color = BLACK
     path = False
+    scheduler = Scheduler()
+    path_cache = PathCache()
+    fingerprint = None  # fingerprint of the grid, kept up to date through barrier edits once taken
+    solver = None
+    planner = None  # incremental planner (I), replans as barriers are edited
+    planned = []
+    adjacency = None  # AdjacencyIndex of the grid, built by the first solve and kept up to date through barrier edits
+    hierarchy = None  # HPAStar clusters of the grid, built by the first P and rebuilt cluster by cluster on edits
+    clock = pygame.time.Clock()
 
     print_help()
 
     run = True
     while run:
+        # advance the running generator/solver by one frame's worth of steps
+        if scheduler.tick():
+            if scheduler.kind == "maze":
+                maze = scheduler.result
+            else:
+                path = scheduler.result
+                if solver:
+                    path_cache.put(fingerprint, start, end, solver, grid, path)
+
         Grid.draw(win, grid, ROWS, width, color)
+        clock.tick(FPS)
+        busy = scheduler.running
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
 
             # Left Click after a maze has been generated/declined to pick a start (first click) and end (second click)
-            if pygame.mouse.get_pressed()[0] and maze:  # LEFT
+            if pygame.mouse.get_pressed()[0] and maze and not busy:  # LEFT
                 pos = pygame.mouse.get_pos()
                 row, col = Grid.get_clicked_pos(pos, ROWS, width)
                 node = grid[row][col]
                 if not start and node != end:
+                    before = cell_key(node)
                     start = node
                     start.make_start()
+                    fingerprint = path_cache.edit(fingerprint, node.get_pos(), before, cell_key(node))
+                    if adjacency:
+                        adjacency.update(node)
+                    if hierarchy:
+                        hierarchy.update(node)
 
                 elif not end and node != start:
+                    before = cell_key(node)
                     end = node
                     end.make_end()
+                    fingerprint = path_cache.edit(fingerprint, node.get_pos(), before, cell_key(node))
+                    if adjacency:
+                        adjacency.update(node)
+                    if hierarchy:
+                        hierarchy.update(node)
 
                 elif node != end and node != start and color == WHITE:
+                    before = cell_key(node)
                     node.make_barrier()
+                    fingerprint = path_cache.edit(fingerprint, node.get_pos(), before, cell_key(node))
+                    if adjacency:
+                        adjacency.update(node)
+                    if hierarchy:
+                        hierarchy.update(node)
+                    if planner:
+                        path = planner.update(node)
+                        planned = show_plan(grid, planner, planned)
 
             # Erase any barriers drawn by the user using right click
-            elif pygame.mouse.get_pressed()[2]:  # RIGHT
+            elif pygame.mouse.get_pressed()[2] and not busy:  # RIGHT
                 pos = pygame.mouse.get_pos()
                 row, col = Grid.get_clicked_pos(pos, ROWS, width)
                 node = grid[row][col]
+                before = cell_key(node)
                 node.reset()
+                fingerprint = path_cache.edit(fingerprint, node.get_pos(), before, cell_key(node))
+                if adjacency:
+                    adjacency.update(node)
+                if hierarchy:
+                    hierarchy.update(node)
                 if node == start:
                     start = None
+                    planner = None
                 elif node == end:
                     end = None
+                    planner = None
+                elif planner:
+                    path = planner.update(node)
+                    planned = show_plan(grid, planner, planned)
 
             if event.type == pygame.KEYDOWN:
 
+                # Speed, pause, single step and cancel for the running algorithm
+                if event.key == pygame.K_UP:
+                    scheduler.faster()
+                    print("Speed:", scheduler.speed_name)
+
+                if event.key == pygame.K_DOWN:
+                    scheduler.slower()
+                    print("Speed:", scheduler.speed_name)
+
+                if event.key == pygame.K_SPACE and busy:
+                    scheduler.toggle_pause()
+
+                if event.key == pygame.K_RIGHT and busy and scheduler.paused and scheduler.step():
+                    if scheduler.kind == "maze":
+                        maze = scheduler.result
+                    else:
+                        path = scheduler.result
+                        if solver:
+                            path_cache.put(fingerprint, start, end, solver, grid, path)
+
+                if event.key == pygame.K_ESCAPE and busy:
+                    scheduler.cancel()
+                    # a half generated maze is not usable, start again from a full grid
+                    if scheduler.kind == "maze":
+                        grid = Grid.make_grid(ROWS, width)
+                        fingerprint = None
+                        adjacency = None
+                        hierarchy = None
+
                 # Press N for no maze generation. Can simply draw barriers yourself.
-                if event.key == pygame.K_n and not start and not end and not maze:
+                if event.key == pygame.K_n and not start and not end and not maze and not busy:
                     color = WHITE
                     maze = True
                     grid = Grid.make_grid(ROWS, width, barrier=False)
+                    fingerprint = None
+                    adjacency = None
+                    hierarchy = None
+
+                # Press S to save the maze to MAZE_FILE, and L to load it back
+                if event.key == pygame.K_s and maze and color == BLACK and not busy:
+                    maze_file.save_maze(MAZE_FILE, grid, generator)
+                    print("Saved maze to", MAZE_FILE)
+
+                if event.key == pygame.K_l and not start and not end and not maze and not busy:
+                    try:
+                        with maze_file.load_maze(MAZE_FILE) as loaded:
+                            if loaded.rows != loaded.cols:
+                                raise ValueError("%s: only square mazes can be shown" % MAZE_FILE)
+                            if loaded.rows > width:
+                                raise ValueError("%s: %d rows don't fit in a %d pixel window"
+                                                 % (MAZE_FILE, loaded.rows, width))
+                            ROWS = loaded.rows
+                            grid = loaded.to_compact_grid().to_node_grid(width)
+                            fingerprint = None
+                            adjacency = None
+                            hierarchy = None
+                            generator = loaded.generator
+                        maze = True
+                        print("Loaded %d x %d maze from %s" % (ROWS, ROWS, MAZE_FILE))
+                    except (OSError, ValueError) as error:
+                        print("Could not load maze:", error)
 
                 # press 1 to generate a maze using the recursive backtracking / random dfs algorithm
-                if event.key == pygame.K_1 and not start and not end and not maze:
+                if event.key == pygame.K_1 and not start and not end and not maze and not busy:
                     for row in grid:
                         for node in row:
                             node.update_neighbors(grid)
-                    maze = algorithms.random_dfs(grid, lambda: Grid.draw(win, grid, ROWS, width))
+                    generator = "random_dfs"
+                    scheduler.start(algorithms.random_dfs_steps(grid), "maze")
 
                 # press 2 to generate a maze using randomized prims algorithm (minimum spanning tree algorithm)
-                if event.key == pygame.K_2 and not start and not end and not maze:
+                if event.key == pygame.K_2 and not start and not end and not maze and not busy:
                     for row in grid:
                         for node in row:
                             node.update_neighbors(grid)
-                    maze = algorithms.prims(grid, lambda: Grid.draw(win, grid, ROWS, width), ROWS)
+                    generator = "prims"
+                    scheduler.start(algorithms.prims_steps(grid), "maze")
 
                 # press 3 to generate a maze using the randomize kruskal's algorithm (similar to prims)
-                if event.key == pygame.K_3 and not start and not end and not maze:
+                if event.key == pygame.K_3 and not start and not end and not maze and not busy:
                     for row in grid:
                         for node in row:
                             node.update_neighbors(grid)
-                    maze = algorithms.kruskals(grid, lambda: Grid.draw(win, grid, ROWS, width), ROWS)
+                    generator = "kruskals"
+                    scheduler.start(algorithms.kruskals_steps(grid), "maze")
 
                 # press 4 to generate a maze using the aldous broder algorithm
                 # WARNING: very slow and frustrating to watch
-                if event.key == pygame.K_4 and not start and not end and not maze:
+                if event.key == pygame.K_4 and not start and not end and not maze and not busy:
                     for row in grid:
                         for node in row:
                             node.update_neighbors(grid)
-                    maze = algorithms.aldous_broder(grid, lambda: Grid.draw(win, grid, ROWS, width), ROWS)
+                    generator = "aldous_broder"
+                    scheduler.start(algorithms.aldous_broder_steps(grid), "maze")
 
                 # press 5 to generate a maze using the hunt and kill algorithm
-                if event.key == pygame.K_5 and not start and not end and not maze:
+                if event.key == pygame.K_5 and not start and not end and not maze and not busy:
                     for row in grid:
                         for node in row:
                             node.update_neighbors(grid)
-                    maze = algorithms.hunt_and_kill(grid, lambda: Grid.draw(win, grid, ROWS, width), ROWS)
-
-                # PATHFINDING ALGORITHMS QWERT
+                    generator = "hunt_and_kill"
+                    scheduler.start(algorithms.hunt_and_kill_steps(grid), "maze")
+
+                # press 6 to generate a maze using wilson's algorithm (same mazes as aldous broder, much faster)
+                if event.key == pygame.K_6 and not start and not end and not maze and not busy:
+                    generator = "wilsons"
+                    scheduler.start(algorithms.wilsons_steps(grid), "maze")
+
+                # PATHFINDING ALGORITHMS QWERTYU
+                # A maze can be solved again, repeats are answered from path_cache while the maze is unchanged
+                # Any of them takes the path display over from the incremental planner
+                if event.key in SOLVER_KEYS and start and end and not busy:
+                    planner = None
+                    if adjacency is None:
+                        adjacency = AdjacencyIndex(grid)
 
                 # Press Q To Solve the maze using the A* Pathfinding Algorithm
-                if event.key == pygame.K_q and start and end and not path:
-                    for row in grid:
-                        for node in row:
-                            node.update_paths(grid)
-
-                    path = algorithms.astar(lambda: Grid.draw(win, grid, ROWS, width, color), grid, start, end)
+                if event.key == pygame.K_q and start and end and not busy:
+                    solver = "astar"
+                    fingerprint, path = solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint)
 
                 # Press W To Solve the maze using Dijkstra's Algorithm
-                if event.key == pygame.K_w and start and end and not path:
-                    for row in grid:
-                        for node in row:
-                            node.update_paths(grid)
-
-                    path = algorithms.dijkstras(lambda: Grid.draw(win, grid, ROWS, width, color), grid, start, end)
+                if event.key == pygame.K_w and start and end and not busy:
+                    solver = "dijkstras"
+                    fingerprint, path = solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint)
 
                 # Press E To Solve the maze using Breadth-First Search
-                if event.key == pygame.K_e and start and end and not path:
-                    for row in grid:
-                        for node in row:
-                            node.update_paths(grid)
-                            node.make_unvisited()
-
-                    path = algorithms.BFS(lambda: Grid.draw(win, grid, ROWS, width, color), grid, start, end)
+                if event.key == pygame.K_e and start and end and not busy:
+                    solver = "BFS"
+                    fingerprint, path = solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint)
 
                 # Press R To Solve the maze using Depth-First Search
-                if event.key == pygame.K_r and start and end and not path:
-                    for row in grid:
-                        for node in row:
-                            node.update_paths(grid)
-                            if not node.is_barrier():
-                                node.make_unvisited()
-
-                    path = algorithms.dfs_pathfinder(lambda: Grid.draw(win, grid, ROWS, width, color), grid, start, end)
+                if event.key == pygame.K_r and start and end and not busy:
+                    solver = "dfs_pathfinder"
+                    fingerprint, path = solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint)
 
                 # Press t To Solve the maze using Greedy Best-First Search
-                if event.key == pygame.K_t and start and end and not path:
-                    for row in grid:
-                        for node in row:
-                            node.update_paths(grid)
-                            node.make_unvisited()
-
-                    path = algorithms.greedy_best_first(lambda: Grid.draw(win, grid, ROWS, width, color), grid, start, end)
+                if event.key == pygame.K_t and start and end and not busy:
+                    solver = "greedy_best_first"
+                    fingerprint, path = solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint)
+
+                # Press Y To Solve the maze using Bidirectional Breadth-First Search
+                if event.key == pygame.K_y and start and end and not busy:
+                    solver = "bidirectional_BFS"
+                    fingerprint, path = solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint)
+
+                # Press U To Solve the maze using Bidirectional A* Search
+                if event.key == pygame.K_u and start and end and not busy:
+                    solver = "bidirectional_astar"
+                    fingerprint, path = solve(scheduler, path_cache, solver, grid, start, end, adjacency, fingerprint)
+
+                # Press J To find a path using Jump Point Search. It ignores walls, so only in the open grid (N) mode
+                if event.key == pygame.K_j and start and end and not busy and color == WHITE:
+                    clear_search(grid, start, end)
+                    solver = None
+                    planner = None
+                    path = False
+                    scheduler.start(algorithms.jump_point_search_steps(grid, start, end), "path")
+
+                # Press I to plan a path with LPA*, which is then repaired live as barriers are drawn or erased
+                if event.key == pygame.K_i and start and end and not busy:
+                    clear_search(grid, start, end)
+                    solver = None
+                    planner = LPAStar(grid, start, end)
+                    path = planner.compute()
+                    planned = show_plan(grid, planner, [])
+                    print("Incremental planner: %d cells expanded" % planner.expanded)
+
+                # Press P to find a path with HPA*, searching the clusters of the grid before the cells
+                if event.key == pygame.K_p and start and end and not busy:
+                    if hierarchy is None:
+                        hierarchy = HPAStar.from_grid(grid, HPA_CLUSTER_SIZE)
+                    clear_search(grid, start, end)
+                    solver = None
+                    planner = None
+                    path = False
+                    scheduler.start(hierarchy.path_steps(grid, start, end), "path")
 
                 # Press C to clear the maze/path back to the original black slate1
                 if event.key == pygame.K_c:
+                    scheduler.cancel()
                     start = None
                     end = None
                     maze = False
                     color = BLACK
                     path = False
+                    planner = None
                     grid = Grid.make_grid(ROWS, width)
+                    fingerprint = None
+                    adjacency = None
+                    hierarchy = None
 
                 if event.key == pygame.K_h:
                     print_help()
@@ -198,4 +431,6 @@ def main(win, width):
     pygame.quit()
 
 
-main(WIN, WIDTH)
\ No newline at end of file
+if __name__ == "__main__":
+    pygame.init()
+    main(Grid.make_window(WIDTH), WIDTH)
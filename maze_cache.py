@@ -0,0 +1,125 @@
+"""
+Memoized maze generation.
+
+The generators in algorithms.py carve a grid in place, so a cached maze can't simply be handed out: the first caller to
+solve on it would paint its search into everyone else's copy. MazeCache stores each generated maze as a MazeSnapshot
+holding only immutable bytes, and every caller gets a fresh grid unpacked from it (copy on use). Snapshots are keyed
+by (generator, rows, seed), generated with their own random.Random(seed) so a key always means the same maze, and the
+least recently used snapshot is evicted once the cache is full.
+"""
+import random
+from collections import OrderedDict
+
+import algorithms
+from compact_grid import CompactGrid
+
+
+class MazeSnapshot:
+    """Immutable copy of a maze's walls. Never mutated, so it can be shared freely"""
+    __slots__ = ("rows", "cols", "walls")
+
+    def __init__(self, rows, cols, walls):
+        """
+        :param rows: Rows in grid
+        :param cols: Columns in grid
+        :param walls: bytes of the 4-bit wall mask of each cell, laid out like CompactGrid.walls
+        """
+        self.rows = rows
+        self.cols = cols
+        self.walls = bytes(walls)
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        :param grid: CompactGrid, or Grid.make_grid style grid of Nodes, holding a maze
+        :return: MazeSnapshot of its walls
+        """
+        if not isinstance(grid, CompactGrid):
+            grid = CompactGrid.from_node_grid(grid)
+        return cls(grid.rows, grid.cols, grid.walls)
+
+    def to_compact_grid(self):
+        """
+        :return: New CompactGrid with the maze's walls and every cell empty and unvisited, ready to be solved on
+        """
+        grid = CompactGrid(self.rows, self.cols, barrier=False)
+        grid.walls[:] = self.walls
+        return grid
+
+    def to_node_grid(self, width):
+        """
+        :param width: Width of win
+        :return: New Grid.make_grid style grid of Nodes with the maze's walls, for display
+        """
+        return self.to_compact_grid().to_node_grid(width)
+
+
+class MazeCache:
+    def __init__(self, maxsize=128):
+        """
+        :param maxsize: Most snapshots kept at once
+        """
+        self.maxsize = maxsize
+        self.snapshots = OrderedDict()  # least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def __contains__(self, key):
+        return key in self.snapshots
+
+    def snapshot(self, generator, rows, seed):
+        """
+        :param generator: name of a generator in algorithms.GENERATORS
+        :param rows: rows in grid
+        :param seed: random seed
+        :return: MazeSnapshot of the maze, generated on a miss
+        """
+        key = (generator, rows, seed)
+        snapshot = self.snapshots.get(key)
+        if snapshot is not None:
+            self.hits += 1
+            self.snapshots.move_to_end(key)
+            return snapshot
+
+        self.misses += 1
+        grid = CompactGrid(rows)
+        algorithms.run(algorithms.GENERATORS[generator](grid, random.Random(seed)), lambda: None)
+        snapshot = MazeSnapshot.from_grid(grid)
+        self.snapshots[key] = snapshot
+        if len(self.snapshots) > self.maxsize:
+            self.snapshots.popitem(last=False)
+        return snapshot
+
+    def grid(self, generator, rows, seed):
+        """
+        :param generator: name of a generator in algorithms.GENERATORS
+        :param rows: rows in grid
+        :param seed: random seed
+        :return: New CompactGrid holding the maze, the caller's to mutate
+        """
+        return self.snapshot(generator, rows, seed).to_compact_grid()
+
+    def node_grid(self, generator, rows, seed, width):
+        """
+        :param generator: name of a generator in algorithms.GENERATORS
+        :param rows: rows in grid
+        :param seed: random seed
+        :param width: Width of win
+        :return: New Grid.make_grid style grid of Nodes holding the maze, the caller's to mutate
+        """
+        return self.snapshot(generator, rows, seed).to_node_grid(width)
+
+    def clear(self):
+        """Drops every snapshot and resets the counters"""
+        self.snapshots.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        :return: dict of hits, misses, maxsize and currsize
+        """
+        return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "currsize": len(self.snapshots)}
@@ -0,0 +1,273 @@
+"""
+Binary maze files.
+
+A maze file is a fixed size header followed by the walls of every cell, packed two cells to a byte:
+
+    offset  size  field
+    0       4     magic b"MAZE"
+    4       2     format version (VERSION)
+    6       2     flags: bit 0 set if the seed field holds the seed the maze was generated with
+    8       4     rows
+    12      4     cols
+    16      8     seed (signed)
+    24      16    generator name, ascii, padded with NUL bytes
+    40            walls: cell i (index = row * cols + col, as in CompactGrid) is the low nibble of byte i // 2 when i
+                  is even and the high nibble when i is odd. Wall bits are compact_grid.TOP, RIGHT, BOTTOM, LEFT.
+
+All integers are little-endian. load_maze memory-maps the file instead of reading it: opening is instant whatever the
+size, nothing is unpacked until a cell is read, and every process opening the same file shares the same pages.
+"""
+import mmap
+import os
+import struct
+
+from compact_grid import CompactGrid, DIRECTIONS, WALL_BITS, TOP, RIGHT, BOTTOM, LEFT
+
+MAGIC = b"MAZE"
+VERSION = 1
+HAS_SEED = 1
+HEADER = struct.Struct("<4sHHIIq16s")
+
+# byte -> its low nibble / its high nibble, for unpacking with bytes.translate
+_LOW = bytes(byte & 15 for byte in range(256))
+_HIGH = bytes(byte >> 4 for byte in range(256))
+_SHIFT = bytes((byte << 4) & 255 for byte in range(256))
+
+
+def _pack(walls):
+    """
+    :param walls: wall masks of an even number of cells
+    :return: bytes holding two cells per byte
+    """
+    low = int.from_bytes(walls[0::2], "little")
+    high = int.from_bytes(bytes(walls[1::2]).translate(_SHIFT), "little")
+    return (low | high).to_bytes(len(walls) // 2, "little")
+
+
+def _unpack(packed):
+    """
+    :param packed: bytes holding two cells per byte
+    :return: bytearray of the wall mask of each cell (even length: drop the last cell if the count was odd)
+    """
+    walls = bytearray(len(packed) * 2)
+    walls[0::2] = packed.translate(_LOW)
+    walls[1::2] = packed.translate(_HIGH)
+    return walls
+
+
+def _header(rows, cols, generator, seed):
+    name = generator.encode("ascii")
+    if len(name) > 16:
+        raise ValueError("generator name is longer than 16 bytes: %r" % generator)
+    flags = HAS_SEED if seed is not None else 0
+    return HEADER.pack(MAGIC, VERSION, flags, rows, cols, seed or 0, name)
+
+
+def pack_maze(grid, generator="", seed=None):
+    """
+    :param grid: CompactGrid, or Grid.make_grid style grid of Nodes, holding the maze
+    :param generator: name of the generator that built the maze (at most 16 ascii characters)
+    :param seed: random seed the maze was generated with, None if unknown
+    :return: bytes of the maze in the maze file format
+    """
+    if not isinstance(grid, CompactGrid):
+        grid = CompactGrid.from_node_grid(grid)
+    walls = grid.walls if grid.size % 2 == 0 else grid.walls + b"\0"
+    return _header(grid.rows, grid.cols, generator, seed) + _pack(walls)
+
+
+def save_maze(path, grid, generator="", seed=None):
+    """
+    :param path: file to write
+    :param grid: CompactGrid, or Grid.make_grid style grid of Nodes, holding the maze
+    :param generator: name of the generator that built the maze (at most 16 ascii characters)
+    :param seed: random seed the maze was generated with, None if unknown
+    :return: None
+    """
+    with open(path, "wb") as file:
+        file.write(pack_maze(grid, generator, seed))
+
+
+def read_mazes(path):
+    """
+    Reads a corpus file: any number of mazes in the maze file format, one after another (see farm.py)
+    :param path: file to read
+    :raises ValueError: if a record is not a maze, has an unsupported version or is truncated
+    :return: Iterator of (generator, seed, CompactGrid), in file order
+    """
+    with open(path, "rb") as file:
+        while True:
+            header = file.read(HEADER.size)
+            if not header:
+                return
+            if len(header) < HEADER.size:
+                raise ValueError("%s: truncated maze header" % path)
+            magic, version, flags, rows, cols, seed, name = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("%s: not a maze file" % path)
+            if version != VERSION:
+                raise ValueError("%s: unsupported maze file version %d" % (path, version))
+
+            packed = file.read((rows * cols + 1) // 2)
+            if len(packed) < (rows * cols + 1) // 2:
+                raise ValueError("%s: truncated, expected %d cells" % (path, rows * cols))
+            grid = CompactGrid(rows, cols, barrier=False)
+            grid.walls[:] = _unpack(packed)[:rows * cols]
+            yield name.rstrip(b"\0").decode("ascii"), seed if flags & HAS_SEED else None, grid
+
+
+def save_rows(path, cols, rows, stream, generator="eller", seed=None):
+    """
+    Writes a maze as it is streamed, one row at a time, without holding it in memory
+    :param path: file to write
+    :param cols: cells per row
+    :param rows: number of rows
+    :param stream: iterator of rows of wall masks, e.g. eller.eller_rows(cols, rows)
+    :param generator: name of the generator that built the maze (at most 16 ascii characters)
+    :param seed: random seed the maze was generated with, None if unknown
+    :raises ValueError: if the stream does not hold exactly rows rows
+    :return: None
+    """
+    written = 0
+    pending = b""  # the last cell of the previous row, when it ended half way through a byte
+    with open(path, "wb") as file:
+        file.write(_header(rows, cols, generator, seed))
+        for walls in stream:
+            walls = pending + walls
+            pending = walls[-1:] if len(walls) % 2 else b""
+            file.write(_pack(walls[:len(walls) - len(pending)]))
+            written += 1
+        if pending:
+            file.write(pending)
+    if written != rows:
+        raise ValueError("stream held %d rows, expected %d" % (written, rows))
+
+
+def load_maze(path):
+    """
+    :param path: maze file written by save_maze or save_rows
+    :return: MappedMaze reading the file in place
+    """
+    return MappedMaze(path)
+
+
+class MappedMaze:
+    """
+    Read-only maze backed by a memory-mapped maze file.
+    Offers the same index based interface as CompactGrid (index, position, neighbor, has_wall, open_neighbors), so
+    code written against those, such as tree_index.MazeTreeIndex, can read walls straight from the file.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: maze file written by save_maze or save_rows
+        :raises ValueError: if the file is not a maze file, has an unsupported version or is truncated
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise ValueError("%s: too short for a maze file" % path)
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, flags, self.rows, self.cols, seed, name = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("%s: not a maze file" % path)
+        if version != VERSION:
+            self.close()
+            raise ValueError("%s: unsupported maze file version %d" % (path, version))
+        if len(self.buffer) < HEADER.size + (self.size + 1) // 2:
+            self.close()
+            raise ValueError("%s: truncated, expected %d cells" % (path, self.size))
+
+        self.seed = seed if flags & HAS_SEED else None
+        self.generator = name.rstrip(b"\0").decode("ascii")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.buffer.close()
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    def walls(self, index):
+        """
+        :param index: flat cell index
+        :return: 4-bit wall mask of the cell
+        """
+        byte = self.buffer[HEADER.size + (index >> 1)]
+        return byte >> 4 if index & 1 else byte & 15
+
+    def row(self, row):
+        """
+        :param row: row number
+        :return: bytes holding the wall mask of each cell in the row, like a row of CompactGrid.walls
+        """
+        start = row * self.cols
+        end = start + self.cols
+        walls = _unpack(self.buffer[HEADER.size + (start >> 1):HEADER.size + ((end + 1) >> 1)])
+        offset = start & 1
+        return bytes(walls[offset:offset + self.cols])
+
+    def iter_rows(self, start=0):
+        """
+        :param start: first row
+        :return: Iterator of rows from start to the bottom, e.g. for eller.load_window
+        """
+        for row in range(start, self.rows):
+            yield self.row(row)
+
+    def neighbor(self, index, direction):
+        """
+        :param index: flat cell index
+        :param direction: wall index (0 top, 1 right, 2 bottom, 3 left)
+        :return: index of the neighbor behind that wall, -1 if it is off the grid
+        """
+        row, col = divmod(index, self.cols)
+        d_row, d_col = DIRECTIONS[direction]
+        row += d_row
+        col += d_col
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return -1
+
+    def has_wall(self, index, direction):
+        return bool(self.walls(index) & WALL_BITS[direction])
+
+    def open_neighbors(self, index):
+        """
+        :param index: flat cell index
+        :return: Indexes of neighbors reachable without crossing a wall
+        """
+        cols = self.cols
+        walls = self.walls(index)
+        row, col = divmod(index, cols)
+        neighbors = []
+        if not walls & RIGHT and row < self.rows - 1:
+            neighbors.append(index + cols)
+        if not walls & LEFT and row > 0:
+            neighbors.append(index - cols)
+        if not walls & BOTTOM and col < cols - 1:
+            neighbors.append(index + 1)
+        if not walls & TOP and col > 0:
+            neighbors.append(index - 1)
+        return neighbors
+
+    def to_compact_grid(self):
+        """
+        :return: CompactGrid holding a copy of the maze, with every cell empty, for display or solving
+        """
+        grid = CompactGrid(self.rows, self.cols, barrier=False)
+        grid.walls[:] = _unpack(self.buffer[HEADER.size:HEADER.size + (self.size + 1) // 2])[:self.size]
+        return grid
@@ -0,0 +1,152 @@
+"""
+Cache of solved paths, invalidated cell by cell as barriers are edited.
+
+Results are keyed by a fingerprint of the maze (its walls and barriers), the start and end cells, and the solver. All
+solvers guaranteed to find the shortest path share one key (SHORTEST), so a path found by A* is reused for BFS.
+
+The fingerprint XORs together a hash of every cell's (position, walls, barrier), so an edit to one cell updates it in
+O(1). Each entry remembers the region its search touched: the explored (open and closed) cells and the path. A search
+only ever looks at its region and the cells next to it, so an edit anywhere else can't change the result. edit()
+drops the entries whose region touches the edited cell or its neighbors, and moves the others over to the new
+fingerprint.
+"""
+from collections import OrderedDict
+
+from Grid import BLUE
+
+SHORTEST = "shortest"
+OPTIMAL_SOLVERS = {"astar", "dijkstras", "BFS", "bidirectional_BFS", "bidirectional_astar"}
+
+
+def solver_key(solver):
+    """
+    :param solver: name of a solver in algorithms.SOLVERS
+    :return: Key its results are cached under, shared by all solvers which find shortest paths
+    """
+    return SHORTEST if solver in OPTIMAL_SOLVERS else solver
+
+
+def cell_key(node):
+    """
+    :param node: Node (or CellView)
+    :return: Hash of the cell's position, walls and barrier state, its share of the maze fingerprint
+    """
+    return hash((node.row, node.col, tuple(node.walls), node.is_barrier()))
+
+
+class PathCache:
+    def __init__(self, maxsize=32):
+        """
+        :param maxsize: Most mazes (fingerprints) to keep results for, least recently used are dropped first
+        """
+        self.maxsize = maxsize
+        self.mazes = OrderedDict()  # fingerprint -> {(start, end, solver key): (found, path)}
+        self.touching = {}  # fingerprint -> {(row, col): set of (start, end, solver key) whose region holds the cell}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(grid):
+        """
+        :param grid: grid being used
+        :return: Fingerprint of the grid's walls and barriers
+        """
+        fingerprint = 0
+        for row in grid:
+            for node in row:
+                fingerprint ^= cell_key(node)
+        return fingerprint
+
+    def get(self, fingerprint, start, end, solver):
+        """
+        :param fingerprint: fingerprint of the maze
+        :param start: (row, col) of the start cell
+        :param end: (row, col) of the end cell
+        :param solver: name of the solver
+        :return: (found, path) if cached, where path is the (row, col) of every path cell, otherwise None
+        """
+        results = self.mazes.get(fingerprint)
+        result = results.get((start, end, solver_key(solver))) if results is not None else None
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.mazes.move_to_end(fingerprint)
+        return result
+
+    def put(self, fingerprint, start, end, solver, grid, found):
+        """
+        Caches the result of a finished search, reading its path and explored region from the grid's colors
+        :param fingerprint: fingerprint of the maze, taken before the search
+        :param start: start node
+        :param end: end node
+        :param solver: name of the solver
+        :param grid: grid the search ran on
+        :param found: the solver's result
+        :return: None
+        """
+        path = []
+        region = {start.get_pos(), end.get_pos()}
+        for row in grid:
+            for node in row:
+                if node.color == BLUE:
+                    path.append(node.get_pos())
+                    region.add(node.get_pos())
+                elif node.is_open() or node.is_closed():
+                    region.add(node.get_pos())
+
+        key = (start.get_pos(), end.get_pos(), solver_key(solver))
+        self.mazes.setdefault(fingerprint, {})[key] = (found, tuple(path))
+        self.mazes.move_to_end(fingerprint)
+        touching = self.touching.setdefault(fingerprint, {})
+        for pos in region:
+            touching.setdefault(pos, set()).add(key)
+
+        if len(self.mazes) > self.maxsize:
+            dropped, _ = self.mazes.popitem(last=False)
+            del self.touching[dropped]
+
+    def edit(self, fingerprint, pos, before, after):
+        """
+        Updates the cache for an edit to one cell
+        :param fingerprint: fingerprint of the maze before the edit, None if it was never taken
+        :param pos: (row, col) of the edited cell
+        :param before: cell_key of the cell before the edit
+        :param after: cell_key of the cell after the edit
+        :return: Fingerprint of the maze after the edit (None if fingerprint was None)
+        """
+        if fingerprint is None or before == after:
+            return fingerprint
+        new_fingerprint = fingerprint ^ before ^ after
+
+        results = self.mazes.pop(fingerprint, None)
+        touching = self.touching.pop(fingerprint, None)
+        if not results:
+            return new_fingerprint
+
+        row, col = pos
+        stale = set()
+        for cell in (pos, (row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)):
+            stale |= touching.get(cell, set())
+        for key in stale:
+            del results[key]
+        if not results:
+            return new_fingerprint
+
+        # everything else is still valid after the edit
+        for cell in list(touching):
+            touching[cell] -= stale
+            if not touching[cell]:
+                del touching[cell]
+        self.mazes.setdefault(new_fingerprint, {}).update(results)
+        self.mazes.move_to_end(new_fingerprint)
+        moved = self.touching.setdefault(new_fingerprint, {})
+        for cell, keys in touching.items():
+            moved.setdefault(cell, set()).update(keys)
+        return new_fingerprint
+
+    def info(self):
+        """
+        :return: dict of hits, misses, maxsize and currsize (mazes with cached results)
+        """
+        return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "currsize": len(self.mazes)}
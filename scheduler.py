@@ -0,0 +1,112 @@
+"""
+Time-sliced scheduler for the step generators in algorithms.py.
+
+main.main hands the scheduler one generator at a time (a maze generation or a search) and calls tick() once per
+frame. Each tick advances the generator by as many steps as the selected speed allows, but never for longer than the
+frame budget, so the window stays responsive however large the grid is. The job can be paused, single-stepped,
+sped up, slowed down or cancelled between frames.
+"""
+import time
+
+INSTANT = "instant"
+
+# steps per frame for each speed setting. None advances as many steps as fit in the frame budget, INSTANT runs the
+# job to completion in a single tick so only the final frame is ever drawn
+SPEEDS = (1, 4, 16, 64, 256, None, INSTANT)
+
+
+class Scheduler:
+    def __init__(self, frame_budget=0.010, speed=2):
+        """
+        :param frame_budget: Seconds of algorithm work allowed per frame
+        :param speed: Index into SPEEDS
+        """
+        self.frame_budget = frame_budget
+        self.speed = speed
+        self.steps = None
+        self.kind = None
+        self.result = None
+        self.paused = False
+
+    @property
+    def running(self):
+        return self.steps is not None
+
+    @property
+    def speed_name(self):
+        steps = SPEEDS[self.speed]
+        if steps is None:
+            return "as fast as the frame budget allows"
+        if steps == INSTANT:
+            return "instant (final frame only)"
+        return "%d step%s per frame" % (steps, "" if steps == 1 else "s")
+
+    def start(self, steps, kind):
+        """
+        Starts a new job, replacing (and closing) any job still running
+        :param steps: step generator from algorithms.py
+        :param kind: caller defined label, e.g. "maze" or "path", readable from self.kind once the job is done
+        :return: None
+        """
+        self.cancel()
+        self.steps = steps
+        self.kind = kind
+        self.result = None
+        self.paused = False
+
+    def cancel(self):
+        """Stops the current job, leaving the grid as it is"""
+        if self.steps is not None:
+            self.steps.close()
+            self.steps = None
+
+    def faster(self):
+        self.speed = min(self.speed + 1, len(SPEEDS) - 1)
+
+    def slower(self):
+        self.speed = max(self.speed - 1, 0)
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def step(self):
+        """
+        Advances the current job by exactly one step, regardless of speed or pause
+        :return: True if the job finished
+        """
+        if self.steps is None:
+            return False
+        return self._advance(1, None)
+
+    def tick(self):
+        """
+        Advances the current job by one frame's worth of steps
+        :return: True if the job finished during this tick (its return value is then in self.result)
+        """
+        if self.steps is None or self.paused:
+            return False
+
+        steps = SPEEDS[self.speed]
+        if steps == INSTANT:
+            return self._advance(None, None)
+        return self._advance(steps, self.frame_budget)
+
+    def _advance(self, limit, budget):
+        """
+        :param limit: Maximum number of steps, None for no limit
+        :param budget: Maximum seconds to spend, None for no limit
+        :return: True if the job finished
+        """
+        deadline = time.perf_counter() + budget if budget is not None else None
+        count = 0
+        while limit is None or count < limit:
+            try:
+                next(self.steps)
+            except StopIteration as stop:
+                self.result = stop.value
+                self.steps = None
+                return True
+            count += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return False
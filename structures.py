@@ -0,0 +1,171 @@
+"""
+Small data structures shared by the maze generation and pathfinding algorithms.
+"""
+import random
+from collections import deque
+from heapq import heappush, heappop
+
+
+class DisjointSet:
+    """
+    Disjoint-set forest (union-find) over the integers 0..size-1, with path compression and union by rank.
+    Any sequence of m find/union calls runs in O(m α(size)) time.
+    """
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.rank = bytearray(size)
+
+    def find(self, item):
+        """
+        :param item: element to look up
+        :return: Representative (root) of the set containing item
+        """
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+
+        # path compression: point everything on the way up straight at the root
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a, b):
+        """
+        Joins the sets containing a and b
+        :param a: element 1
+        :param b: element 2
+        :return: True if a and b were in different sets, False if they were already joined
+        """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+
+        rank = self.rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        return True
+
+
+class PriorityFrontier:
+    """
+    Min-priority frontier built on heapq, for single-threaded search (queue.PriorityQueue takes a lock on every call).
+    Ties are broken by insertion order, so items never need to be comparable themselves.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.count = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def empty(self):
+        return not self.heap
+
+    def put(self, item, priority):
+        heappush(self.heap, (priority, self.count, item))
+        self.count += 1
+
+    def get(self):
+        """
+        :return: Item with the lowest priority
+        """
+        return heappop(self.heap)[2]
+
+    def get_with_priority(self):
+        """
+        :return: (priority, item) for the item with the lowest priority
+        """
+        priority, _, item = heappop(self.heap)
+        return priority, item
+
+    def peek_priority(self):
+        """
+        :return: Lowest priority in the frontier, without removing anything
+        """
+        return self.heap[0][0]
+
+
+class FifoFrontier:
+    """First in, first out frontier built on collections.deque"""
+
+    def __init__(self):
+        self.items = deque()
+
+    def __len__(self):
+        return len(self.items)
+
+    def empty(self):
+        return not self.items
+
+    def put(self, item):
+        self.items.append(item)
+
+    def get(self):
+        return self.items.popleft()
+
+
+class LifoFrontier(FifoFrontier):
+    """Last in, first out frontier (stack) built on collections.deque"""
+
+    def get(self):
+        return self.items.pop()
+
+
+class RandomizedSet:
+    """
+    Set with O(1) add, remove and uniformly random choice. Items are kept in a list, with a dict of each item's
+    position; removing an item moves the last item into its slot.
+    """
+
+    def __init__(self, items=()):
+        self.items = []
+        self.positions = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, item):
+        """
+        :param item: item to add
+        :return: True if it was added, False if it was already in the set
+        """
+        if item in self.positions:
+            return False
+        self.positions[item] = len(self.items)
+        self.items.append(item)
+        return True
+
+    def remove(self, item):
+        """
+        :param item: item to remove
+        :raises KeyError: if item is not in the set
+        :return: None
+        """
+        position = self.positions.pop(item)
+        last = self.items.pop()
+        if position < len(self.items):
+            self.items[position] = last
+            self.positions[last] = position
+
+    def choice(self, rng=random):
+        """
+        :param rng: random number generator (random.Random or the random module)
+        :raises IndexError: if the set is empty
+        :return: Uniformly random item, left in the set
+        """
+        return rng.choice(self.items)
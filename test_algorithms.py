@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+import algorithms
+from compact_grid import CompactGrid, BARRIER, PATH
+
+
+def random_barriers(rows, barriers, rng):
+    """Open grid with barriers dropped on random cells, so most cells can be reached more than one way"""
+    grid = CompactGrid(rows, barrier=False)
+    for _ in range(barriers):
+        grid.state[rng.randrange(grid.size)] = BARRIER
+    return grid
+
+
+def path_length(solver, grid, start, end):
+    """
+    :return: cells the solver paints as the path, None if it finds no path
+    """
+    grid = grid.copy()
+    found = algorithms.run(algorithms.SOLVERS[solver](grid, grid[start[0]][start[1]], grid[end[0]][end[1]]),
+                           lambda: None)
+    return grid.state.count(PATH) if found else None
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_dijkstras_path_length_matches_bfs(seed):
+    rng = random.Random(seed)
+    grid = random_barriers(8, 15, rng)
+    for _ in range(25):
+        start = grid.index(rng.randrange(grid.rows), rng.randrange(grid.cols))
+        end = grid.index(rng.randrange(grid.rows), rng.randrange(grid.cols))
+        if start == end or BARRIER in (grid.state[start], grid.state[end]):
+            continue
+        start, end = grid.position(start), grid.position(end)
+        assert path_length("dijkstras", grid, start, end) == path_length("BFS", grid, start, end)
@@ -0,0 +1,138 @@
+"""
+Path queries on perfect mazes through a lowest-common-ancestor index.
+
+Every generator in algorithms.py produces a perfect maze: its passages form a spanning tree, so there is exactly one
+path between any two cells. Instead of searching the grid for every (start, end) query, MazeTreeIndex roots that tree
+once, records each cell's parent and depth, and builds a binary lifting table (the 2^k-th ancestor of every cell).
+Then:
+    distance(start, end)  is depth[start] + depth[end] - 2 * depth[lca], answered in O(log n)
+    path(start, end)      walks both cells up to their lca, in time proportional to the path length
+Building the index takes O(n log n) time and memory.
+"""
+from array import array
+
+from compact_grid import CompactGrid
+
+
+class MazeTreeIndex:
+    def __init__(self, maze, root=0):
+        """
+        :param maze: CompactGrid holding a perfect maze (see from_grid for Node grids)
+        :param root: flat index of the cell to root the tree at
+        :raises ValueError: if the maze has loops or cells that can't be reached, since paths are then not unique
+        """
+        self.cols = maze.cols
+        size = maze.size
+
+        # breadth first walk of the tree from the root, recording parents and depths
+        parent = array("i", [-1]) * size
+        depth = array("i", [0]) * size
+        parent[root] = root
+        order = [root]
+        for cell in order:
+            for neighbor in maze.open_neighbors(cell):
+                if neighbor == parent[cell]:
+                    continue
+                if parent[neighbor] != -1:
+                    raise ValueError("maze has loops, paths between cells are not unique")
+                parent[neighbor] = cell
+                depth[neighbor] = depth[cell] + 1
+                order.append(neighbor)
+        if len(order) != size:
+            raise ValueError("maze is not connected: %d of %d cells reachable" % (len(order), size))
+
+        # up[k][cell] is the 2^k-th ancestor of cell (the root is its own ancestor)
+        self.depth = depth
+        self.up = [parent]
+        for _ in range(max(max(depth).bit_length(), 1) - 1):
+            prev = self.up[-1]
+            self.up.append(array("i", [prev[ancestor] for ancestor in prev]))
+
+    @classmethod
+    def from_grid(cls, grid, root=(0, 0)):
+        """
+        :param grid: Grid.make_grid style grid of Nodes, or a CompactGrid, holding a generated maze
+        :param root: (row, col) of the cell to root the tree at
+        :return: MazeTreeIndex
+        """
+        maze = grid if isinstance(grid, CompactGrid) else CompactGrid.from_node_grid(grid)
+        return cls(maze, maze.index(*root))
+
+    def lca(self, a, b):
+        """
+        :param a: flat index of cell 1
+        :param b: flat index of cell 2
+        :return: Flat index of the deepest cell that is an ancestor of both
+        """
+        depth = self.depth
+        up = self.up
+        if depth[a] < depth[b]:
+            a, b = b, a
+
+        # lift a to the depth of b
+        diff = depth[a] - depth[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+
+        # lift both while they stay below the lca
+        for k in range(len(up) - 1, -1, -1):
+            if up[k][a] != up[k][b]:
+                a = up[k][a]
+                b = up[k][b]
+        return up[0][a]
+
+    def distance(self, start, end):
+        """
+        :param start: (row, col) of the start cell
+        :param end: (row, col) of the end cell
+        :return: Number of steps on the path between them
+        """
+        a = start[0] * self.cols + start[1]
+        b = end[0] * self.cols + end[1]
+        return self.depth[a] + self.depth[b] - 2 * self.depth[self.lca(a, b)]
+
+    def path(self, start, end):
+        """
+        :param start: (row, col) of the start cell
+        :param end: (row, col) of the end cell
+        :return: List of (row, col) of every cell on the path, start and end included
+        """
+        a = start[0] * self.cols + start[1]
+        b = end[0] * self.cols + end[1]
+        top = self.lca(a, b)
+        parent = self.up[0]
+
+        forward = [a]
+        while a != top:
+            a = parent[a]
+            forward.append(a)
+
+        backward = []
+        while b != top:
+            backward.append(b)
+            b = parent[b]
+
+        cols = self.cols
+        return [divmod(cell, cols) for cell in forward + backward[::-1]]
+
+    def distances(self, pairs):
+        """
+        :param pairs: iterable of ((row, col), (row, col)) start/end pairs
+        :return: List of path lengths, one per pair
+        """
+        distance = self.distance
+        return [distance(start, end) for start, end in pairs]
+
+    def paths(self, pairs):
+        """
+        :param pairs: iterable of ((row, col), (row, col)) start/end pairs
+        :return: List of paths (lists of (row, col)), one per pair
+        """
+        path = self.path
+        return [path(start, end) for start, end in pairs]
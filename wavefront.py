@@ -0,0 +1,133 @@
+"""
+Vectorized breadth first search with NumPy: the distance from one cell to every cell of a maze.
+
+algorithms.BFS expands one cell at a time in Python, and stops at the end cell. distance_field expands a whole BFS
+layer (the wavefront) per step with array operations instead: the frontier is an array of flat cell indexes, and for
+each of the four directions one boolean lookup in a precomputed "can move" mask (built once from the wall bitmask and
+the barriers) picks the frontier cells with an open side, one addition moves them to their neighbors and one lookup in
+the distance array drops the cells already reached. The Python loop runs once per layer rather than once per cell.
+
+It returns two dense (rows, cols) arrays for the whole maze:
+    distance   steps from the source, -1 where the source can't be reached
+    direction  wall index (0 top, 1 right, 2 bottom, 3 left) of the step back towards the source, -1 at the source
+               and at unreachable cells. Following it from any cell walks a shortest path to the source.
+
+Moves follow CompactGrid.open_neighbors: a cell's own wall must be open and the neighbor must not be a barrier.
+
+Usage:
+    python wavefront.py 1000 --generator kruskals --seed 1
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+import algorithms
+from compact_grid import CompactGrid, DIRECTIONS, OPPOSITE, WALL_BITS, BARRIER
+
+
+def move_masks(grid):
+    """
+    :param grid: CompactGrid
+    :return: for each wall index, a flat bool array of the cells that can move through that side
+    """
+    rows, cols = grid.rows, grid.cols
+    walls = np.frombuffer(bytes(grid.walls), dtype=np.uint8).reshape(rows, cols)
+    open_cell = np.frombuffer(bytes(grid.state), dtype=np.uint8).reshape(rows, cols) != BARRIER
+
+    masks = []
+    for direction, (d_row, d_col) in enumerate(DIRECTIONS):
+        can = (walls & WALL_BITS[direction]) == 0
+        # the neighbor must be on the grid and not a barrier: shift open_cell back by the move
+        target = np.zeros((rows, cols), dtype=bool)
+        target[max(-d_row, 0):rows - max(d_row, 0), max(-d_col, 0):cols - max(d_col, 0)] = \
+            open_cell[max(d_row, 0):rows + min(d_row, 0), max(d_col, 0):cols + min(d_col, 0)]
+        masks.append((can & target).ravel())
+    return masks
+
+
+def distance_field(grid, source):
+    """
+    Breadth first search from source over the whole maze, one wavefront layer per step
+    :param grid: CompactGrid, or Grid.make_grid style grid of Nodes
+    :param source: (row, col) of the cell to measure from
+    :return: (distance, direction) int32 and int8 arrays of shape (rows, cols)
+    """
+    if not isinstance(grid, CompactGrid):
+        grid = CompactGrid.from_node_grid(grid)
+    rows, cols = grid.rows, grid.cols
+    offsets = [d_row * cols + d_col for d_row, d_col in DIRECTIONS]
+    masks = move_masks(grid)
+
+    distance = np.full(rows * cols, -1, dtype=np.int32)
+    direction = np.full(rows * cols, -1, dtype=np.int8)
+    frontier = np.array([source[0] * cols + source[1]], dtype=np.intp)
+    distance[frontier] = 0
+
+    layer = 0
+    while frontier.size:
+        layer += 1
+        reached = []
+        for side in range(4):
+            cells = frontier[masks[side][frontier]] + offsets[side]
+            cells = cells[distance[cells] < 0]
+            # one side moves every cell by the same offset, so cells holds no duplicates
+            distance[cells] = layer
+            direction[cells] = OPPOSITE[side]
+            reached.append(cells)
+        frontier = np.concatenate(reached)
+
+    return distance.reshape(rows, cols), direction.reshape(rows, cols)
+
+
+def path_to_source(distance, direction, cell):
+    """
+    :param distance: distance array from distance_field
+    :param direction: direction array from distance_field
+    :param cell: (row, col) to start from
+    :return: list of (row, col) from cell to the source, both included. Empty if the source can't be reached
+    """
+    row, col = cell
+    if distance[row, col] < 0:
+        return []
+    path = [(row, col)]
+    while direction[row, col] >= 0:
+        d_row, d_col = DIRECTIONS[direction[row, col]]
+        row += d_row
+        col += d_col
+        path.append((row, col))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the vectorized distance field against per-cell BFS")
+    parser.add_argument("rows", type=int, help="grid size (rows and columns)")
+    parser.add_argument("--generator", default="kruskals", help="maze generator, 'none' for an open grid")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default 1)")
+    args = parser.parse_args(argv)
+
+    if args.generator == "none":
+        grid = CompactGrid(args.rows, barrier=False)
+    else:
+        grid = CompactGrid(args.rows)
+        algorithms.run(algorithms.GENERATORS[args.generator](grid, random.Random(args.seed)), lambda: None)
+        grid.reset_search()
+
+    start = time.perf_counter()
+    distance, _ = distance_field(grid, (0, 0))
+    vectorized = time.perf_counter() - start
+    print("distance_field: %.3fs, %d layers" % (vectorized, distance.max() + 1))
+
+    # per-cell BFS to the farthest cell visits every cell too
+    far = divmod(int(distance.argmax()), grid.cols)
+    start = time.perf_counter()
+    algorithms.run(algorithms.BFS_steps(grid, grid[0][0], grid[far[0]][far[1]]), lambda: None)
+    per_cell = time.perf_counter() - start
+    print("BFS:            %.3fs (%.1fx)" % (per_cell, per_cell / vectorized))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())